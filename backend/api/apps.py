@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from reportlab.pdfbase.ttfonts import TTFError
+
+        from . import signals  # noqa: F401
+        from .shopping_list import register_fonts
+
+        try:
+            register_fonts()
+        except TTFError:
+            pass
@@ -0,0 +1,48 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from recipes.catalogue import get_changed_at, get_version
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def recipe_validators(recipe, user):
+    etag = make_etag(
+        recipe.pk,
+        recipe.updated_at.isoformat(),
+        recipe.author.updated_at.isoformat(),
+        get_version(),
+        int(recipe.is_favorited),
+        int(recipe.is_in_shopping_cart),
+        int(recipe.author_is_subscribed)
+    )
+    if user.is_authenticated:
+        return etag, None
+    return etag, int(max(
+        recipe.updated_at.timestamp(),
+        recipe.author.updated_at.timestamp(),
+        get_changed_at()
+    ))
+
+
+def not_modified(request, etag, last_modified=None):
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
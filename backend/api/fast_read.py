@@ -0,0 +1,84 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+
+from recipes.models import Recipe, RecipeIngredient
+
+
+User = get_user_model()
+
+RECIPE_FIELDS = (
+    'id', 'name', 'image', 'image_variants', 'text', 'cooking_time',
+    'author_id', 'author__username', 'author__first_name',
+    'author__last_name', 'author__email', 'author__avatar',
+    'author__avatar_variants', 'is_favorited', 'is_in_shopping_cart',
+    'author_is_subscribed',
+)
+
+
+def file_url(request, field, name):
+    if not name:
+        return None
+    return request.build_absolute_uri(field.storage.url(name))
+
+
+def variant_urls(request, value):
+    def url(name):
+        url = default_storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    return {
+        variant: {
+            image_format: url(name)
+            for image_format, name in formats.items()
+        }
+        for variant, formats in value.get('variants', {}).items()
+    }
+
+
+def build_recipes(rows, request):
+    ingredients = defaultdict(list)
+    for item in RecipeIngredient.objects.filter(
+        recipe_id__in=[row['id'] for row in rows]
+    ).order_by('pk').values(
+        'recipe_id', 'ingredient_id', 'ingredient__name',
+        'ingredient__measurement_unit', 'amount'
+    ):
+        ingredients[item['recipe_id']].append({
+            'id': item['ingredient_id'],
+            'name': item['ingredient__name'],
+            'measurement_unit': item['ingredient__measurement_unit'],
+            'amount': item['amount'],
+        })
+
+    image_field = Recipe._meta.get_field('image')
+    avatar_field = User._meta.get_field('avatar')
+    return [
+        {
+            'id': row['id'],
+            'author': {
+                'id': row['author_id'],
+                'username': row['author__username'],
+                'first_name': row['author__first_name'],
+                'last_name': row['author__last_name'],
+                'email': row['author__email'],
+                'is_subscribed': row['author_is_subscribed'],
+                'avatar': file_url(
+                    request, avatar_field, row['author__avatar']
+                ),
+                'avatar_variants': variant_urls(
+                    request, row['author__avatar_variants']
+                ),
+            },
+            'ingredients': ingredients[row['id']],
+            'is_favorited': row['is_favorited'],
+            'is_in_shopping_cart': row['is_in_shopping_cart'],
+            'name': row['name'],
+            'image': file_url(request, image_field, row['image']),
+            'image_variants': variant_urls(request, row['image_variants']),
+            'text': row['text'],
+            'cooking_time': row['cooking_time'],
+        }
+        for row in rows
+    ]
@@ -1,26 +1,45 @@
 import django_filters
 
-from recipes.models import Ingredient, Recipe
+from recipes.models import Ingredient, Recipe, RecipeIngredient
+from recipes.search import search_ingredients
 
 
 class IngredientFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='istartswith'
+        method='filter_name'
     )
 
     class Meta:
         model = Ingredient
         fields = ['name']
 
+    def filter_name(self, queryset, name, value):
+        return search_ingredients(queryset, value)
+
 
 class RecipeFilter(django_filters.FilterSet):
+    ORDERINGS = {
+        'popular': ('-favorites_count', '-id'),
+        'cooking_time': ('cooking_time', '-id'),
+        '-cooking_time': ('-cooking_time', '-id'),
+        'newest': ('-id',),
+    }
+
     is_favorited = django_filters.NumberFilter(
         method='filter_is_favorited'
     )
     is_in_shopping_cart = django_filters.NumberFilter(
         method='filter_is_in_shopping_cart'
     )
+    cooking_time = django_filters.RangeFilter()
+    ingredients = django_filters.ModelMultipleChoiceFilter(
+        queryset=Ingredient.objects.all(),
+        method='filter_ingredients'
+    )
+    ordering = django_filters.ChoiceFilter(
+        choices=[(key, key) for key in ORDERINGS],
+        method='filter_ordering'
+    )
 
     class Meta:
         model = Recipe
@@ -43,3 +62,15 @@ class RecipeFilter(django_filters.FilterSet):
             return queryset.filter(shopping_cart__user=user)
         else:
             return queryset.exclude(shopping_cart__user=user)
+
+    def filter_ingredients(self, queryset, name, value):
+        for ingredient in value:
+            queryset = queryset.filter(
+                pk__in=RecipeIngredient.objects.filter(
+                    ingredient=ingredient
+                ).values('recipe')
+            )
+        return queryset
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*self.ORDERINGS[value])
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+
+from recipes import constants
+from recipes.catalogue import get_version
+from .serializers import RecipeReadSerializer
+
+
+def fragment_key(recipe, version, base_url):
+    return (
+        f'recipe:fragment:{recipe.pk}:{recipe.updated_at.isoformat()}:'
+        f'{recipe.author.updated_at.isoformat()}:{version}:{base_url}'
+    )
+
+
+def merge_user_flags(fragment, recipe):
+    return {
+        **fragment,
+        'author': {
+            **fragment['author'],
+            'is_subscribed': recipe.author_is_subscribed
+        },
+        'is_favorited': recipe.is_favorited,
+        'is_in_shopping_cart': recipe.is_in_shopping_cart,
+    }
+
+
+def render_recipes(recipes, context, prefetch):
+    version = get_version()
+    base_url = context['request'].build_absolute_uri('/')
+    keys = {
+        recipe.pk: fragment_key(recipe, version, base_url)
+        for recipe in recipes
+    }
+
+    fragments = cache.get_many(keys.values())
+    missing = [
+        recipe for recipe in recipes if keys[recipe.pk] not in fragments
+    ]
+    if missing:
+        prefetch_related_objects(missing, prefetch)
+        rendered = {
+            keys[recipe.pk]: dict(data) for recipe, data in zip(
+                missing,
+                RecipeReadSerializer(missing, many=True, context=context).data
+            )
+        }
+        cache.set_many(rendered, constants.RECIPE_FRAGMENT_TIMEOUT)
+        fragments.update(rendered)
+
+    return [
+        merge_user_flags(fragments[keys[recipe.pk]], recipe)
+        for recipe in recipes
+    ]
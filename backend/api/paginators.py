@@ -1,6 +1,188 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class PageLimitPagination(PageNumberPagination):
     page_size_query_param = 'limit'
     page_query_param = 'page'
+
+
+class LimitCursorPagination(CursorPagination):
+    ordering = '-id'
+    page_size_query_param = 'limit'
+    cursor_query_param = 'cursor'
+
+
+class KeysetPagination(PageLimitPagination):
+    keyset_query_param = 'before'
+
+    def paginate_keys(self, fetch, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        before = request.query_params.get(self.keyset_query_param)
+        if before is not None and not before.isdigit():
+            raise NotFound('Invalid cursor.')
+
+        keys = fetch(before and int(before), self.page_size + 1)
+        self.has_next = len(keys) > self.page_size
+        self.keys = keys[:self.page_size]
+        return self.keys
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.keyset_query_param,
+            self.keys[-1]
+        )
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+
+class PageLimitOrCursorPagination(PageLimitPagination):
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    skip_count_values = ('0', 'false')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        self.without_count = False
+
+        if self.cursor_query_param in request.query_params:
+            self.cursor = LimitCursorPagination()
+            return self.cursor.paginate_queryset(queryset, request, view)
+
+        count = request.query_params.get(self.count_query_param)
+        if count in self.skip_count_values:
+            self.without_count = True
+            return self.paginate_without_count(queryset, request)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_without_count(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        number = request.query_params.get(self.page_query_param, '1')
+        if number in self.last_page_strings:
+            number = str(self.get_last_page(queryset))
+        if not number.isdigit() or int(number) < 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=number, message='Invalid page.'
+            ))
+        self.number = int(number)
+
+        offset = (self.number - 1) * self.page_size
+        rows = list(queryset[offset:offset + self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        return rows[:self.page_size]
+
+    def get_last_page(self, queryset):
+        return max(1, math.ceil(queryset.count() / self.page_size))
+
+    def get_next_link(self):
+        if not self.without_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.number + 1
+        )
+
+    def get_previous_link(self):
+        if not self.without_count:
+            return super().get_previous_link()
+        if self.number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.number - 1
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor is not None:
+            return self.cursor.get_paginated_response(data)
+        if self.without_count:
+            return Response({
+                'count': None,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            })
+        return super().get_paginated_response(data)
+
+
+class CachedCountPagination(PageLimitOrCursorPagination):
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_is_approximate = False
+        self.known_count = None
+        if (self.cursor_query_param in request.query_params
+                or request.query_params.get(self.count_query_param)
+                in self.skip_count_values):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor = None
+        self.without_count = True
+        page = self.paginate_without_count(queryset, request)
+        if not page and self.number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.number,
+                message='That page contains no results'
+            ))
+
+        seen = (self.number - 1) * self.page_size + len(page)
+        if self.has_next:
+            self.known_count = max(self.get_count(queryset), seen + 1)
+        else:
+            self.known_count = seen
+        return page
+
+    def get_count(self, queryset):
+        if not queryset.query.where:
+            estimate = self.estimate_count(queryset)
+            if estimate >= settings.APPROXIMATE_COUNT_THRESHOLD:
+                self.count_is_approximate = True
+                return estimate
+
+        sql, params = queryset.values('pk').order_by().query.sql_with_params()
+        key = 'pagination:count:' + hashlib.sha256(
+            f'{queryset.db}:{sql}:{params}'.encode()
+        ).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return -1
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else -1
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.known_count is not None:
+            response.data['count'] = self.known_count
+            response.data['count_is_approximate'] = self.count_is_approximate
+        return response
@@ -0,0 +1,92 @@
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from recipes.catalogue import get_version
+
+
+TAG_KEY = 'response:tag:{}'
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_tag_versions(tags):
+    cache = get_cache()
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags):
+    get_cache().set_many(
+        {TAG_KEY.format(tag): time.time_ns() for tag in tags}, None
+    )
+
+
+def make_key(request, tags):
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw = repr((
+        request.build_absolute_uri(request.path),
+        params,
+        get_tag_versions(tags),
+        get_version()
+    ))
+    return 'response:' + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def store(key, response):
+    get_cache().set(key, (
+        response.status_code,
+        response.content,
+        {name: response[name] for name in CACHED_HEADERS if name in response}
+    ), settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def restore(request, cached):
+    status_code, content, headers = cached
+    response = HttpResponse(content, status=status_code)
+    for name, value in headers.items():
+        response[name] = value
+
+    last_modified = headers.get('Last-Modified')
+    return get_conditional_response(
+        request,
+        etag=headers.get('ETag'),
+        last_modified=last_modified and parse_http_date_safe(last_modified),
+        response=response
+    )
+
+
+class AnonymousResponseCacheMixin:
+    def cached_response(self, request, tags, handler, *args, **kwargs):
+        if (request.user.is_authenticated
+                or request.accepted_renderer.format != 'json'):
+            return handler(request, *args, **kwargs)
+
+        key = make_key(request, tags)
+        cached = get_cache().get(key)
+        if cached is not None:
+            return restore(request, cached)
+
+        response = handler(request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            response.add_post_render_callback(partial(store, key))
+        return response
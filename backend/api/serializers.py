@@ -1,48 +1,141 @@
+import base64
+import binascii
+
+import filetype
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from drf_extra_fields.fields import Base64ImageField
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db import transaction
+from drf_extra_fields.fields import Base64FieldMixin, Base64ImageField
+from PIL import Image
 
+from recipes import cart_items, constants
 from recipes.models import Ingredient, Recipe, RecipeIngredient
+from .fast_read import variant_urls
 
 
 User = get_user_model()
 
 
 class StrictBase64ImageField(Base64ImageField):
+    TOO_LARGE_MESSAGE = 'Image file is too large.'
+    TOO_MANY_PIXELS_MESSAGE = 'Image dimensions are too large.'
+
     def to_internal_value(self, data):
         if data == '':
             raise serializers.ValidationError('This field is required.')
-        return super().to_internal_value(data)
+        if not isinstance(data, str):
+            return super().to_internal_value(data)
+
+        start = data.find(';base64,')
+        start = 0 if start == -1 else start + len(';base64,')
+        length = len(data) - start
+        if length % 4:
+            raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+        if length // 4 * 3 > constants.IMAGE_UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(self.TOO_LARGE_MESSAGE)
+
+        upload = TemporaryUploadedFile(
+            self.get_file_name(None), None, 0, None
+        )
+        try:
+            extension = self.decode_to_file(data, start, upload)
+            self.check_dimensions(upload)
+        except serializers.ValidationError:
+            upload.close()
+            raise
+        self.close_with_request(upload)
+        upload.name = f'{upload.name}.{extension}'
+        return super(Base64FieldMixin, self).to_internal_value(upload)
+
+    def close_with_request(self, upload):
+        request = self.context.get('request')
+        if request is None:
+            return
+        request._request.FILES.appendlist(self.field_name, upload)
+
+    def decode_to_file(self, data, start, upload):
+        extension = None
+        chunk_size = constants.IMAGE_DECODE_CHUNK_SIZE
+        for offset in range(start, len(data), chunk_size):
+            try:
+                chunk = base64.b64decode(
+                    data[offset:offset + chunk_size], validate=True
+                )
+            except (binascii.Error, ValueError):
+                raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+            if extension is None:
+                extension = filetype.guess_extension(chunk)
+            upload.write(chunk)
+        upload.size = upload.tell()
+        upload.seek(0)
+        if extension == 'jpeg':
+            extension = 'jpg'
+        if extension not in self.ALLOWED_TYPES:
+            raise serializers.ValidationError(self.INVALID_TYPE_MESSAGE)
+        return extension
+
+    def check_dimensions(self, upload):
+        try:
+            with Image.open(upload.temporary_file_path()) as image:
+                width, height = image.size
+        except (OSError, Image.DecompressionBombError):
+            raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+        if width * height > constants.IMAGE_UPLOAD_MAX_PIXELS:
+            raise serializers.ValidationError(self.TOO_MANY_PIXELS_MESSAGE)
+
+
+class IdListSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=constants.RELATION_BATCH_MAX_SIZE
+    )
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    def to_representation(self, value):
+        return variant_urls(self.context.get('request'), value)
 
 
 class ShortRecipesSerializer(serializers.ModelSerializer):
     image = serializers.ImageField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Recipe
-        fields = ('id', 'name', 'image', 'cooking_time')
+        fields = ('id', 'name', 'image', 'image_variants', 'cooking_time')
 
 
 class UserSerializer(serializers.ModelSerializer):
     avatar = StrictBase64ImageField()
+    avatar_variants = ImageVariantsField()
     is_subscribed = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = User
         fields = ('id', 'username', 'first_name',
                   'last_name', 'email',
-                  'is_subscribed', 'avatar')
+                  'is_subscribed', 'avatar', 'avatar_variants')
 
     def get_is_subscribed(self, obj):
-        user = self.context.get('request').user
-        if user.is_authenticated:
-            return user.subscriptions.filter(id=obj.id).exists()
-        return False
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        request = self.context.get('request')
+        if not request.user.is_authenticated:
+            return False
+        if not hasattr(request, 'subscribed_ids'):
+            request.subscribed_ids = set(
+                request.user.subscriptions.values_list(
+                    'subscribe_id', flat=True
+                )
+            )
+        return obj.id in request.subscribed_ids
 
 
 class SubscriptionsUserSerializer(UserSerializer):
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.SerializerMethodField()
+    recipes_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
@@ -66,9 +159,6 @@ class SubscriptionsUserSerializer(UserSerializer):
 
         return serializers.data
 
-    def get_recipes_count(self, obj):
-        return obj.recipes.count()
-
 
 class IngredientSerializer(serializers.ModelSerializer):
     class Meta:
@@ -92,14 +182,47 @@ class RecipeIngredientReadSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'measurement_unit', 'amount']
 
 
+class IngredientField(serializers.PrimaryKeyRelatedField):
+    @staticmethod
+    def to_pk(data):
+        if isinstance(data, bool):
+            raise TypeError
+        return Ingredient._meta.pk.get_prep_value(data)
+
+    def to_internal_value(self, data):
+        ingredients = getattr(self.parent.parent, 'ingredients', None)
+        if ingredients is None:
+            return super().to_internal_value(data)
+        try:
+            pk = self.to_pk(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in ingredients:
+            self.fail('does_not_exist', pk_value=data)
+        return ingredients[pk]
+
+
+class RecipeIngredientListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            ids = set()
+            for item in data:
+                try:
+                    ids.add(IngredientField.to_pk(item.get('id')))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+            ids.discard(None)
+            self.ingredients = Ingredient.objects.in_bulk(ids)
+        return super().to_internal_value(data)
+
+
 class RecipeIngredientWriteSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all()
-    )
+    id = IngredientField(queryset=Ingredient.objects.all())
 
     class Meta:
         model = RecipeIngredient
         fields = ['id', 'amount']
+        list_serializer_class = RecipeIngredientListSerializer
 
     def validate_amount(self, value):
         if value <= 0:
@@ -112,20 +235,30 @@ class RecipeReadSerializer(serializers.ModelSerializer):
     is_in_shopping_cart = serializers.SerializerMethodField()
     author = UserSerializer(read_only=True)
     ingredients = RecipeIngredientReadSerializer(many=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Recipe
         fields = ['id', 'author', 'ingredients', 'is_favorited',
-                  'is_in_shopping_cart', 'name', 'image', 'text',
-                  'cooking_time']
+                  'is_in_shopping_cart', 'name', 'image', 'image_variants',
+                  'text', 'cooking_time']
+
+    def to_representation(self, instance):
+        if hasattr(instance, 'author_is_subscribed'):
+            instance.author.is_subscribed = instance.author_is_subscribed
+        return super().to_representation(instance)
 
     def get_is_favorited(self, obj):
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         request = self.context.get('request')
         if not request.user.is_authenticated:
             return False
         return obj.favorited_by.filter(user=request.user).exists()
 
     def get_is_in_shopping_cart(self, obj):
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
         request = self.context.get('request')
         if not request.user.is_authenticated:
             return False
@@ -175,9 +308,32 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
 
         return recipe
 
+    def update_recipe_ingredients(self, instance, ingredients):
+        links = {
+            link.ingredient_id: link for link in instance.ingredients.all()
+        }
+        old_amounts = {pk: link.amount for pk, link in links.items()}
+        new_amounts = {item['id'].id: item['amount'] for item in ingredients}
+
+        changed = []
+        for pk, link in links.items():
+            if pk in new_amounts and link.amount != new_amounts[pk]:
+                link.amount = new_amounts[pk]
+                changed.append(link)
+        RecipeIngredient.objects.bulk_update(changed, ['amount'])
+        self.add_recipe_ingredients(
+            instance,
+            [item for item in ingredients if item['id'].id not in links]
+        )
+        removed = links.keys() - new_amounts.keys()
+        if removed:
+            instance.ingredients.filter(ingredient_id__in=removed).delete()
+
+        cart_items.change_recipe_amounts(instance, old_amounts, new_amounts)
+
     def update(self, instance, validated_data):
         ingredients_data = validated_data.pop('ingredients', None)
-        instance.ingredients.all().delete()
-        self.add_recipe_ingredients(instance, ingredients_data)
-
-        return super().update(instance, validated_data)
+        with transaction.atomic():
+            if ingredients_data is not None:
+                self.update_recipe_ingredients(instance, ingredients_data)
+            return super().update(instance, validated_data)
@@ -0,0 +1,172 @@
+import csv
+import hashlib
+import json
+from functools import cache as once
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+from django.core.cache import cache
+from django.http import FileResponse, StreamingHttpResponse
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+from rest_framework.renderers import BaseRenderer
+
+
+FONT_NAME = 'DejaVu'
+FONT_FILE = 'DejaVuSans.ttf'
+FONT_SIZE = 14
+TITLE = 'Список покупок:'
+TOP = 800
+BOTTOM = 40
+LINE_HEIGHT = 15
+CACHE_TIMEOUT = 60 * 60
+BUFFER_MAX_SIZE = 1024 * 1024
+FILENAME = 'shopping_list'
+
+
+@once
+def register_fonts():
+    pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_FILE))
+
+
+def format_line(item):
+    return (
+        f'- {item["ingredient__name"]}: {item["total_amount"]} '
+        f'{item["ingredient__measurement_unit"]}'
+    )
+
+
+def render_pdf(rows, output):
+    register_fonts()
+    pdf = canvas.Canvas(output, pagesize=A4)
+    pdf.setFont(FONT_NAME, FONT_SIZE)
+
+    y = TOP
+    pdf.drawString(100, y, TITLE)
+
+    for item in rows:
+        y -= LINE_HEIGHT
+        if y < BOTTOM:
+            pdf.showPage()
+            pdf.setFont(FONT_NAME, FONT_SIZE)
+            y = TOP
+        pdf.drawString(110, y, format_line(item))
+
+    pdf.showPage()
+    pdf.save()
+
+
+def get_cache_key(rows):
+    digest = hashlib.sha256(
+        json.dumps(rows, ensure_ascii=False, default=str).encode()
+    ).hexdigest()
+    return f'shopping_list:pdf:{digest}'
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class ShoppingListRenderer(BaseRenderer):
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return json.dumps(data, ensure_ascii=False).encode()
+
+    def get_filename(self):
+        return f'{FILENAME}.{self.format}'
+
+    def stream(self, rows):
+        yield f'{TITLE}\n'
+        for item in rows:
+            yield f'{format_line(item)}\n'
+
+    def export(self, data):
+        return StreamingHttpResponse(
+            self.stream(data.iterator()),
+            content_type=f'{self.media_type}; charset={self.charset}',
+            headers={
+                'Content-Disposition': (
+                    f'attachment; filename="{self.get_filename()}"'
+                )
+            }
+        )
+
+
+class PDFShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+
+    def export(self, data):
+        rows = list(data)
+        key = get_cache_key(rows)
+
+        content = cache.get(key)
+        if content is not None:
+            output = BytesIO(content)
+        else:
+            output = SpooledTemporaryFile(max_size=BUFFER_MAX_SIZE)
+            render_pdf(rows, output)
+            cached = output.tell() <= BUFFER_MAX_SIZE
+            output.seek(0)
+            if cached:
+                cache.set(key, output.read(), CACHE_TIMEOUT)
+                output.seek(0)
+
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=self.get_filename(),
+            content_type=self.media_type
+        )
+
+
+class TextShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+class CSVShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def stream(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(['name', 'measurement_unit', 'amount'])
+        for item in rows:
+            yield writer.writerow([
+                item['ingredient__name'],
+                item['ingredient__measurement_unit'],
+                item['total_amount']
+            ])
+
+
+class JSONShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'application/json'
+    format = 'json'
+
+    def stream(self, rows):
+        separator = '['
+        for item in rows:
+            yield separator + json.dumps({
+                'name': item['ingredient__name'],
+                'measurement_unit': item['ingredient__measurement_unit'],
+                'amount': item['total_amount']
+            }, ensure_ascii=False)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+
+
+SHOPPING_LIST_RENDERERS = [
+    PDFShoppingListRenderer,
+    TextShoppingListRenderer,
+    CSVShoppingListRenderer,
+    JSONShoppingListRenderer,
+]
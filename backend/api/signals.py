@@ -0,0 +1,46 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recipes.images import variants_ready
+from recipes.models import Recipe, RecipeIngredient
+from .response_cache import invalidate_tags
+
+
+User = get_user_model()
+
+
+def invalidate_recipe(recipe_id):
+    transaction.on_commit(
+        partial(invalidate_tags, 'recipes', f'recipe:{recipe_id}')
+    )
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+def invalidate_recipe_responses(instance, **kwargs):
+    invalidate_recipe(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=RecipeIngredient)
+def invalidate_recipe_ingredient_responses(instance, **kwargs):
+    invalidate_recipe(instance.recipe_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_author_responses(update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(partial(invalidate_tags, 'authors'))
+
+
+@receiver(variants_ready, sender=Recipe)
+def invalidate_recipe_variant_responses(instance, **kwargs):
+    invalidate_tags('recipes', f'recipe:{instance.pk}')
+
+
+@receiver(variants_ready, sender=User)
+def invalidate_avatar_variant_responses(**kwargs):
+    invalidate_tags('authors')
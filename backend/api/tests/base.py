@@ -0,0 +1,85 @@
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APIClient, APITestCase
+
+from recipes.models import Ingredient, Recipe, RecipeIngredient
+
+
+User = get_user_model()
+
+
+def make_png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def clear_caches():
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
+
+
+class FixturesMixin:
+    @classmethod
+    def create_user(cls, n):
+        return User.objects.create(
+            email=f'user{n}@example.com',
+            username=f'user{n}',
+            first_name='First',
+            last_name='Last'
+        )
+
+    @classmethod
+    def create_ingredients(cls, count):
+        return Ingredient.objects.bulk_create([
+            Ingredient(name=f'ingredient {n}', measurement_unit='g')
+            for n in range(count)
+        ])
+
+    @classmethod
+    def create_recipe(cls, author, ingredients, n=0):
+        recipe = Recipe(
+            author=author,
+            name=f'recipe {n}',
+            text='text',
+            cooking_time=n % 30 + 1
+        )
+        recipe.image.save('image.png', ContentFile(make_png()), save=False)
+        recipe.save()
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(
+                recipe=recipe, ingredient=ingredient, amount=n + 1
+            )
+            for ingredient in ingredients
+        ])
+        return recipe
+
+    def client_for(self, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+
+class MediaMixin:
+    @classmethod
+    def setUpClass(cls):
+        media = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(
+            MEDIA_ROOT=media, IMAGE_PROCESSING_WORKERS=0
+        ))
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        clear_caches()
+
+
+class APIBaseTestCase(MediaMixin, FixturesMixin, APITestCase):
+    pass
@@ -0,0 +1,107 @@
+from recipes.constants import RELATION_BATCH_MAX_SIZE
+from recipes.models import (FavoriteRecipes, Recipe, ShoppingCart,
+                            ShoppingCartItem)
+from users.models import Subscriptions
+from .base import APIBaseTestCase
+
+
+MISSING = 10 ** 6
+
+
+class BatchRelationsTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        cls.author = cls.create_user(1)
+        cls.other = cls.create_user(2)
+        ingredients = cls.create_ingredients(2)
+        cls.first, cls.second, cls.third = [
+            cls.create_recipe(cls.author, ingredients, n) for n in range(3)
+        ]
+
+    def batch(self, method, url, ids):
+        response = getattr(self.client_for(self.user), method)(
+            url, {'ids': ids}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return [
+            (row['id'], row['status']) for row in response.json()['results']
+        ]
+
+    def test_favorite_batch(self):
+        FavoriteRecipes.objects.create(user=self.user, recipe=self.second)
+        url = '/api/recipes/favorite/'
+        self.assertEqual(
+            self.batch('post', url, [
+                self.first.pk, self.second.pk, self.first.pk, MISSING
+            ]),
+            [(self.first.pk, 201), (self.second.pk, 400), (MISSING, 404)]
+        )
+        self.assertEqual(
+            Recipe.objects.get(pk=self.first.pk).favorites_count, 1
+        )
+        self.assertEqual(
+            self.batch('delete', url, [
+                self.second.pk, self.third.pk, self.second.pk, MISSING
+            ]),
+            [(self.second.pk, 204), (self.third.pk, 400), (MISSING, 404)]
+        )
+        self.assertEqual(
+            set(FavoriteRecipes.objects.filter(
+                user=self.user
+            ).values_list('recipe', flat=True)),
+            {self.first.pk}
+        )
+
+    def test_shopping_cart_batch(self):
+        url = '/api/recipes/shopping_cart/'
+        self.assertEqual(
+            self.batch('post', url, [self.first.pk, self.first.pk, MISSING]),
+            [(self.first.pk, 201), (MISSING, 404)]
+        )
+        self.assertTrue(ShoppingCart.objects.filter(
+            user=self.user, recipe=self.first
+        ).exists())
+        self.assertTrue(
+            ShoppingCartItem.objects.filter(user=self.user).exists()
+        )
+        self.assertEqual(
+            self.batch('delete', url, [self.first.pk, self.second.pk]),
+            [(self.first.pk, 204), (self.second.pk, 400)]
+        )
+        self.assertFalse(
+            ShoppingCartItem.objects.filter(user=self.user).exists()
+        )
+
+    def test_subscribe_batch(self):
+        url = '/api/users/subscribe/'
+        self.assertEqual(
+            self.batch('post', url, [
+                self.author.pk, self.user.pk, self.author.pk, MISSING
+            ]),
+            [(self.author.pk, 201), (self.user.pk, 400), (MISSING, 404)]
+        )
+        self.assertEqual(
+            self.batch('delete', url, [self.author.pk, self.other.pk]),
+            [(self.author.pk, 204), (self.other.pk, 400)]
+        )
+        self.assertFalse(Subscriptions.objects.filter(user=self.user).exists())
+
+    def test_invalid_ids_are_rejected(self):
+        client = self.client_for(self.user)
+        for data in (
+            {}, {'ids': []}, {'ids': [0]}, {'ids': ['x']},
+            {'ids': list(range(1, RELATION_BATCH_MAX_SIZE + 2))},
+        ):
+            with self.subTest(data=data):
+                response = client.post(
+                    '/api/recipes/favorite/', data, format='json'
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(FavoriteRecipes.objects.exists())
+
+    def test_anonymous_is_rejected(self):
+        response = self.client.post(
+            '/api/recipes/favorite/', {'ids': [self.first.pk]}, format='json'
+        )
+        self.assertEqual(response.status_code, 401)
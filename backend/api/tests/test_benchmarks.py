@@ -0,0 +1,226 @@
+import base64
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from api import shopping_list
+from api.filters import RecipeFilter
+from recipes.catalogue import PrefixIndex
+from recipes.models import Recipe
+from .base import (APIBaseTestCase, FixturesMixin, clear_caches,
+                   make_png)
+
+
+def report(title, rows):
+    if os.getenv('BENCHMARK_REPORT'):
+        sys.stderr.write(f'\n{title}\n')
+        for size, values in rows:
+            sys.stderr.write(
+                f'  {size:>8}: '
+                + ', '.join(f'{key} {value}' for key, value in values.items())
+                + '\n'
+            )
+
+
+def benchmark_sizes(*sizes):
+    if os.getenv('BENCHMARK_FULL'):
+        return sizes
+    return sizes[:-1]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+class ShoppingListRenderBenchmark(SimpleTestCase):
+    SIZES = (10, 1000, 10000)
+
+    def setUp(self):
+        clear_caches()
+
+    def make_rows(self, size):
+        return [
+            {
+                'ingredient__name': f'ingredient {n}',
+                'ingredient__measurement_unit': 'g',
+                'total_amount': n + 1,
+            }
+            for n in range(size)
+        ]
+
+    def test_pdf_render_and_cache(self):
+        renderer = shopping_list.PDFShoppingListRenderer()
+        results = []
+        for size in self.SIZES:
+            rows = self.make_rows(size)
+            response, cold = timed(renderer.export, rows)
+            content = b''.join(response.streaming_content)
+            self.assertTrue(content.startswith(b'%PDF'))
+
+            with patch.object(shopping_list, 'render_pdf') as render_pdf:
+                response, warm = timed(renderer.export, rows)
+                render_pdf.assert_not_called()
+            self.assertEqual(b''.join(response.streaming_content), content)
+            results.append((size, {'cold ms': cold, 'cached ms': warm}))
+        report('Shopping list PDF export', results)
+
+
+class RecipeCreateBenchmark(APIBaseTestCase):
+    SIZES = (1, 10, 40, 100, 200)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        cls.ingredients = cls.create_ingredients(max(cls.SIZES) + 1)
+        cls.image = (
+            'data:image/png;base64,' + base64.b64encode(make_png()).decode()
+        )
+
+    def create(self, ingredients):
+        return self.client_for(self.user).post('/api/recipes/', {
+            'ingredients': [
+                {'id': ingredient.pk, 'amount': 1}
+                for ingredient in ingredients
+            ],
+            'name': 'recipe',
+            'image': self.image,
+            'text': 'text',
+            'cooking_time': 10,
+        }, format='json')
+
+    def test_create_latency_by_ingredient_count(self):
+        queries = set()
+        results = []
+        for size in self.SIZES:
+            with CaptureQueriesContext(connection) as context:
+                response, ms = timed(self.create, self.ingredients[:size])
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(len(response.json()['ingredients']), size)
+            queries.add(len(context))
+            results.append((size, {'ms': ms, 'queries': len(context)}))
+        report('Recipe create', results)
+        self.assertEqual(len(queries), 1, results)
+
+    def test_unknown_ingredient_errors_per_item(self):
+        missing = self.ingredients[-1]
+        missing.delete()
+        response = self.create([self.ingredients[0], missing])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['ingredients'][0], {})
+        self.assertIn('id', response.json()['ingredients'][1])
+        self.assertFalse(Recipe.objects.exists())
+
+
+class IngredientAutocompleteBenchmark(SimpleTestCase):
+    SIZES = benchmark_sizes(10_000, 100_000, 1_000_000)
+    ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщыэюя '
+    QUERIES = ('а', 'аб', 'абв', 'соль', 'ая ')
+
+    def make_rows(self, size):
+        rng = random.Random(size)
+        return [
+            (pk, ''.join(
+                rng.choice(self.ALPHABET) for _ in range(rng.randint(4, 24))
+            ))
+            for pk in range(size)
+        ]
+
+    def test_prefix_index_search(self):
+        results = []
+        for size in self.SIZES:
+            rows = self.make_rows(size)
+            index, build = timed(PrefixIndex, rows)
+            timings = {'build ms': build}
+            for value in self.QUERIES:
+                (prefix, contains), ms = timed(index.search, value)
+                timings[f'{value!r} ms'] = ms
+                self.assertEqual(prefix, [
+                    pk for key, pk in index.entries if key.startswith(value)
+                ])
+                if len(value) >= 3:
+                    self.assertEqual(contains, [
+                        pk for key, pk in index.entries
+                        if value in key and not key.startswith(value)
+                    ])
+            results.append((size, timings))
+        report('Ingredient autocomplete', results)
+
+
+class RecipeIndexPlanBenchmark(FixturesMixin, TransactionTestCase):
+    RECIPES = benchmark_sizes(10_000, 1_000_000)[-1]
+    INGREDIENTS_PER_RECIPE = 20
+    INGREDIENTS = 1000
+
+    def populate(self):
+        author = self.create_user(0)
+        first = self.create_ingredients(self.INGREDIENTS)[0].pk
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+                'SELECT n + 1 FROM seq WHERE n < %s) '
+                'INSERT INTO recipes_recipe (name, text, cooking_time, '
+                'image, image_variants, author_id, favorites_count, '
+                'shopping_cart_count, updated_at) '
+                "SELECT 'recipe', 'text', n % 120 + 1, 'image.png', '{}', "
+                '%s, n * 7919 % 1000, 0, CURRENT_TIMESTAMP FROM seq',
+                [self.RECIPES, author.pk]
+            )
+            cursor.execute(
+                'WITH RECURSIVE seq(k) AS (SELECT 0 UNION ALL '
+                'SELECT k + 1 FROM seq WHERE k < %s) '
+                'INSERT INTO recipes_recipeingredient '
+                '(recipe_id, ingredient_id, amount) '
+                'SELECT recipe.id, %s + (recipe.id * 31 + seq.k * 977) % %s, '
+                '1 FROM recipes_recipe recipe CROSS JOIN seq',
+                [self.INGREDIENTS_PER_RECIPE - 1, first, self.INGREDIENTS]
+            )
+            cursor.execute(
+                'VACUUM ANALYZE' if connection.vendor == 'postgresql'
+                else 'ANALYZE'
+            )
+        return first
+
+    def get_queryset(self, data):
+        return RecipeFilter(data, Recipe.objects.all()).qs[:10]
+
+    def test_filters_use_indexes(self):
+        ingredient = self.populate()
+        covering = (
+            'Index Only Scan using' if connection.vendor == 'postgresql'
+            else 'COVERING INDEX'
+        )
+        cases = {
+            'popular': (
+                {'ordering': 'popular'}, 'recipe_popular_idx'
+            ),
+            'cooking_time': (
+                {'ordering': 'cooking_time', 'cooking_time_min': 10,
+                 'cooking_time_max': 20},
+                'recipe_cooking_time_idx'
+            ),
+            'ingredients': (
+                {'ingredients': [ingredient, ingredient + 977]},
+                f'{covering} recipeingredient_reverse_idx'
+            ),
+        }
+        results = []
+        for name, (data, index) in cases.items():
+            with self.subTest(name):
+                queryset = self.get_queryset(data)
+                self.assertIn(index, queryset.explain())
+                rows, ms = timed(list, queryset)
+                self.assertTrue(rows)
+                results.append((name, {'ms': ms}))
+        report(
+            f'Recipe filters over {self.RECIPES} recipes and '
+            f'{self.RECIPES * self.INGREDIENTS_PER_RECIPE} ingredient rows',
+            results
+        )
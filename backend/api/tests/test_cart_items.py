@@ -0,0 +1,112 @@
+from recipes.cart_items import rebuild_cart_items
+from recipes.models import RecipeIngredient, ShoppingCart, ShoppingCartItem
+from .base import APIBaseTestCase
+
+
+class CartItemsConsistencyTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = cls.create_user(0)
+        cls.author.set_password('author-password')
+        cls.author.save()
+        cls.reader = cls.create_user(1)
+        cls.ingredients = cls.create_ingredients(4)
+        cls.first = cls.create_recipe(cls.author, cls.ingredients[:3], 1)
+        cls.second = cls.create_recipe(cls.reader, cls.ingredients[2:], 2)
+
+    def get_items(self):
+        return set(ShoppingCartItem.objects.values_list(
+            'user_id', 'ingredient_id', 'amount'
+        ))
+
+    def assert_items_match_rebuild(self):
+        items = self.get_items()
+        rebuild_cart_items([self.author.pk, self.reader.pk])
+        self.assertEqual(items, self.get_items())
+
+    def add_to_cart(self, user, recipe):
+        response = self.client_for(user).post(
+            f'/api/recipes/{recipe.pk}/shopping_cart/'
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_author_account_deletion_updates_carts(self):
+        self.add_to_cart(self.reader, self.first)
+        self.add_to_cart(self.reader, self.second)
+
+        response = self.client_for(self.author).delete(
+            '/api/users/me/', {'current_password': 'author-password'}
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assert_items_match_rebuild()
+
+        content = b''.join(self.client_for(self.reader).get(
+            '/api/recipes/download_shopping_cart/', {'format': 'txt'}
+        ).streaming_content).decode()
+        self.assertNotIn('ingredient 0', content)
+        self.assertIn('ingredient 3', content)
+
+    def test_recipe_deletion_updates_carts(self):
+        self.add_to_cart(self.reader, self.first)
+        response = self.client_for(self.author).delete(
+            f'/api/recipes/{self.first.pk}/'
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(ShoppingCartItem.objects.exists())
+
+    def test_orm_cart_changes_update_items(self):
+        cart = ShoppingCart.objects.create(user=self.reader, recipe=self.first)
+        self.assert_items_match_rebuild()
+
+        cart.recipe = self.second
+        cart.save()
+        self.assert_items_match_rebuild()
+
+        ShoppingCart.objects.create(user=self.author, recipe=self.first)
+        ShoppingCart.objects.filter(user=self.author).delete()
+        self.assert_items_match_rebuild()
+
+        cart.delete()
+        self.assertFalse(ShoppingCartItem.objects.exists())
+
+    def test_admin_ingredient_edits_update_items(self):
+        self.add_to_cart(self.reader, self.first)
+        admin = self.create_user(2)
+        admin.is_staff = admin.is_superuser = True
+        admin.save()
+        self.client.force_login(admin)
+
+        links = list(self.first.ingredients.order_by('pk'))
+        data = {
+            'name': self.first.name,
+            'text': self.first.text,
+            'cooking_time': self.first.cooking_time,
+            'author': self.author.pk,
+            'ingredients-TOTAL_FORMS': len(links) + 1,
+            'ingredients-INITIAL_FORMS': len(links),
+            'ingredients-MIN_NUM_FORMS': 0,
+            'ingredients-MAX_NUM_FORMS': 1000,
+        }
+        for n, link in enumerate(links):
+            data.update({
+                f'ingredients-{n}-id': link.pk,
+                f'ingredients-{n}-recipe': self.first.pk,
+                f'ingredients-{n}-ingredient': link.ingredient_id,
+                f'ingredients-{n}-amount': link.amount,
+            })
+        data['ingredients-0-amount'] = 50
+        data['ingredients-1-DELETE'] = 'on'
+        data.update({
+            f'ingredients-{len(links)}-recipe': self.first.pk,
+            f'ingredients-{len(links)}-ingredient': self.ingredients[3].pk,
+            f'ingredients-{len(links)}-amount': 7,
+        })
+
+        response = self.client.post(
+            f'/admin/recipes/recipe/{self.first.pk}/change/', data
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            RecipeIngredient.objects.filter(recipe=self.first).count(), 3
+        )
+        self.assert_items_match_rebuild()
@@ -0,0 +1,102 @@
+import io
+import tempfile
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+from django.utils.http import parse_http_date
+
+from recipes.models import Ingredient, Recipe
+from .base import APIBaseTestCase
+
+
+class IngredientValidatorsTest(APIBaseTestCase):
+    def load(self, content):
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', encoding='utf-8'
+        ) as file:
+            file.write(content)
+            file.flush()
+            call_command(
+                'load_ingredients', file.name, stdout=io.StringIO()
+            )
+
+    def test_reload_changes_ingredient_validators(self):
+        self.load('соль,г\nсахар,г\n')
+        ingredient = Ingredient.objects.get(name='соль')
+        url = f'/api/ingredients/{ingredient.pk}/'
+        first = self.client.get(url)
+        first_list = self.client.get('/api/ingredients/')
+
+        self.load('соль,кг\n')
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['measurement_unit'], 'кг')
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+        second_list = self.client.get(
+            '/api/ingredients/', HTTP_IF_NONE_MATCH=first_list['ETag']
+        )
+        self.assertEqual(second_list.status_code, 200)
+        self.assertGreaterEqual(
+            parse_http_date(second_list['Last-Modified']),
+            parse_http_date(first_list['Last-Modified'])
+        )
+
+    def test_changes_from_other_processes_are_picked_up(self):
+        self.load('соль,г\n')
+        first = self.client.get('/api/ingredients/')
+        Ingredient.objects.update(
+            measurement_unit='кг', updated_at=timezone.now()
+        )
+        later = time.time() + settings.INGREDIENT_CATALOGUE_CHECK_INTERVAL + 1
+        with mock.patch('time.time', return_value=later):
+            second = self.client.get(
+                '/api/ingredients/', HTTP_IF_NONE_MATCH=first['ETag']
+            )
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()[0]['measurement_unit'], 'кг')
+
+    def test_unchanged_ingredient_is_not_modified(self):
+        self.load('соль,г\n')
+        url = f'/api/ingredients/{Ingredient.objects.get().pk}/'
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def get_later(self, url, since):
+        with mock.patch('time.time', return_value=time.time() + 2):
+            return self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+
+    def test_ingredient_deletion_advances_list_last_modified(self):
+        self.load('соль,г\nсахар,г\n')
+        since = self.client.get('/api/ingredients/')['Last-Modified']
+        with self.captureOnCommitCallbacks(execute=True):
+            Ingredient.objects.get(name='сахар').delete()
+
+        response = self.get_later('/api/ingredients/', since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_ingredient_rename_advances_recipe_last_modified(self):
+        ingredient = self.create_ingredients(1)[0]
+        recipe = self.create_recipe(self.create_user(0), [ingredient])
+        Recipe.objects.filter(pk=recipe.pk).update(
+            updated_at=timezone.now() - timezone.timedelta(days=1)
+        )
+        url = f'/api/recipes/{recipe.pk}/'
+        since = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=since
+        ).status_code, 304)
+
+        ingredient.name = 'переименованный'
+        with self.captureOnCommitCallbacks(execute=True):
+            ingredient.save()
+        response = self.get_later(url, since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['ingredients'][0]['name'], 'переименованный'
+        )
@@ -0,0 +1,93 @@
+import random
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+from recipes.models import FavoriteRecipes, RecipeIngredient, ShoppingCart
+from users.models import Subscriptions
+from .base import APIBaseTestCase, clear_caches, make_png
+
+
+TEXTS = (
+    'plain',
+    'юникод ✓',
+    'line\nbreak\t"quoted"\\',
+    'separators    ',
+    '<script>&</script>',
+)
+QUERIES = (
+    '?limit=7',
+    '?limit=50',
+    '?ordering=popular&limit=20',
+    '?ordering=cooking_time',
+    '?is_favorited=1&limit=30',
+    '?is_in_shopping_cart=1',
+    '?limit=9&page=3',
+    '?cursor=&limit=11',
+    '?count=0&limit=13&page=2',
+    '?cooking_time_min=5&cooking_time_max=20',
+)
+
+
+class FastPathParityTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(20240518)
+        cls.users = [cls.create_user(n) for n in range(8)]
+        for user in cls.users[::3]:
+            user.avatar.save('avatar.png', ContentFile(make_png()))
+            user.first_name = 'Имя «x» "q"'
+            user.save()
+        ingredients = cls.create_ingredients(40)
+
+        recipes = []
+        for n in range(60):
+            recipe = cls.create_recipe(
+                rng.choice(cls.users),
+                rng.sample(ingredients, rng.randint(1, 12)),
+                n
+            )
+            recipe.text = rng.choice(TEXTS)
+            recipe.cooking_time = rng.randint(1, 40)
+            recipe.save()
+            recipes.append(recipe)
+
+        links = list(RecipeIngredient.objects.all())
+        rng.shuffle(links)
+        RecipeIngredient.objects.all().delete()
+        RecipeIngredient.objects.bulk_create(links)
+
+        for user in cls.users:
+            for recipe in rng.sample(recipes, 10):
+                FavoriteRecipes.objects.create(user=user, recipe=recipe)
+            for recipe in rng.sample(recipes, 5):
+                ShoppingCart.objects.create(user=user, recipe=recipe)
+            for author in rng.sample(cls.users, 3):
+                if author != user:
+                    Subscriptions.objects.create(user=user, subscribe=author)
+
+    def fetch(self, user, query, fast):
+        clear_caches()
+        with override_settings(RECIPE_LIST_FAST_PATH=fast):
+            response = self.client_for(user).get('/api/recipes/' + query)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_fast_path_matches_serializers_byte_for_byte(self):
+        for user in self.users[:4] + [None]:
+            for query in QUERIES:
+                with self.subTest(user=user, query=query):
+                    self.assertEqual(
+                        self.fetch(user, query, fast=True),
+                        self.fetch(user, query, fast=False)
+                    )
+
+    def test_renderer_matches_json_renderer(self):
+        data = self.client_for(self.users[0]).get(
+            '/api/recipes/?limit=60'
+        ).json()
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
@@ -0,0 +1,95 @@
+import base64
+from unittest import mock
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+
+from api.serializers import ShortRecipesSerializer
+from recipes.models import Recipe
+from .base import APIBaseTestCase, make_png
+
+
+IMAGE = 'data:image/png;base64,' + base64.b64encode(make_png()).decode()
+VARIANTS = {
+    'source': 'recipes/images/image.png',
+    'variants': {'small': {'webp': 'recipes/images/variants/image.webp'}},
+}
+
+
+class ImageVariantsTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        cls.recipe = cls.create_recipe(cls.user, cls.create_ingredients(1))
+        Recipe.objects.filter(pk=cls.recipe.pk).update(
+            image_variants=VARIANTS
+        )
+        cls.recipe.refresh_from_db()
+
+    def test_variants_without_request_are_relative(self):
+        data = ShortRecipesSerializer(self.recipe).data
+        self.assertEqual(
+            data['image_variants'],
+            {'small': {'webp': '/media/recipes/images/variants/image.webp'}}
+        )
+
+    def test_shopping_cart_with_variants(self):
+        response = self.client_for(self.user).post(
+            f'/api/recipes/{self.recipe.pk}/shopping_cart/'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()['image_variants']['small']['webp'],
+            'http://testserver/media/recipes/images/variants/image.webp'
+        )
+
+    def test_synchronous_processing_keeps_connection(self):
+        with mock.patch(
+            'recipes.images.close_old_connections'
+        ) as close, self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(self.user).put(
+                '/api/users/me/avatar/', {'avatar': IMAGE}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        close.assert_not_called()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.avatar_variants['variants'])
+        response = self.client.get(f'/api/users/{self.user.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['avatar_variants'])
+
+
+class TemporaryUploadTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        cls.ingredient = cls.create_ingredients(1)[0]
+
+    def assert_upload_closed(self, method, url, data, status_code):
+        uploads = []
+        original = TemporaryUploadedFile.__init__
+
+        def init(upload, *args, **kwargs):
+            original(upload, *args, **kwargs)
+            uploads.append(upload)
+
+        with mock.patch.object(TemporaryUploadedFile, '__init__', init):
+            response = getattr(self.client_for(self.user), method)(
+                url, data, format='json'
+            )
+        self.assertEqual(response.status_code, status_code)
+        self.assertEqual(len(uploads), 1)
+        self.assertTrue(uploads[0].file.closed)
+
+    def test_stored_upload_is_closed(self):
+        self.assert_upload_closed(
+            'put', '/api/users/me/avatar/', {'avatar': IMAGE}, 200
+        )
+
+    def test_rejected_upload_is_closed(self):
+        self.assert_upload_closed('post', '/api/recipes/', {
+            'ingredients': [{'id': self.ingredient.pk, 'amount': 1}],
+            'name': 'recipe',
+            'image': IMAGE,
+            'text': 'text',
+            'cooking_time': 0,
+        }, 400)
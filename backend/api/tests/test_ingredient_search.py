@@ -0,0 +1,86 @@
+import sqlite3
+from unittest import skipUnless
+
+from django.db import connection
+
+from api.filters import IngredientFilter
+from recipes.models import Ingredient
+from recipes.search import CONTAINS_RANK, PREFIX_RANK, search_ingredients
+from .base import APIBaseTestCase
+
+
+class IngredientSearchTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Ingredient.objects.bulk_create([
+            Ingredient(name=name, measurement_unit='g')
+            for name in ('Соль', 'соль морская', 'Морская соль', 'Сахар',
+                         'Масло', 'Пересоленный сыр')
+        ])
+
+    def search(self, name):
+        response = self.client.get('/api/ingredients/', {'name': name})
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.json()]
+
+    def test_prefix_matches_rank_before_contains_matches(self):
+        self.assertEqual(
+            self.search('сол'),
+            ['Соль', 'соль морская', 'Морская соль', 'Пересоленный сыр']
+        )
+
+    def test_short_queries_match_prefix_only(self):
+        self.assertEqual(self.search('с'), ['Сахар', 'Соль', 'соль морская'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite variable limit')
+    def test_match_sets_above_sqlite_variable_limit(self):
+        Ingredient.objects.bulk_create([
+            Ingredient(name=f'x{n:04}', measurement_unit='g')
+            for n in range(5000)
+        ])
+        connection.ensure_connection()
+        limit = connection.connection.getlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER
+        )
+        connection.connection.setlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999
+        )
+        try:
+            names = [
+                ingredient.name for ingredient in IngredientFilter(
+                    {'name': 'x'}, Ingredient.objects.all()
+                ).qs
+            ]
+        finally:
+            connection.connection.setlimit(
+                sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit
+            )
+        self.assertEqual(len(names), 5000)
+        self.assertEqual(names[:2], ['x0000', 'x0001'])
+
+    def test_name_search_does_not_query_the_database(self):
+        self.search('сол')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.search('сах'), ['Сахар'])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Postgres search branch')
+    def test_postgres_prefix_and_contains_branches(self):
+        queryset = search_ingredients(Ingredient.objects.all(), 'сол')
+        self.assertIn('UNION', str(queryset.query))
+        rows = [(item.rank, item.name) for item in queryset]
+        self.assertEqual([rank for rank, _ in rows], [
+            PREFIX_RANK, PREFIX_RANK, CONTAINS_RANK, CONTAINS_RANK
+        ])
+        self.assertEqual(
+            {name for _, name in rows[:2]}, {'Соль', 'соль морская'}
+        )
+        self.assertEqual(
+            {name for _, name in rows[2:]},
+            {'Морская соль', 'Пересоленный сыр'}
+        )
+
+        short = search_ingredients(Ingredient.objects.all(), 'с')
+        self.assertNotIn('UNION', str(short.query))
+        self.assertEqual(
+            {item.name for item in short}, {'Сахар', 'Соль', 'соль морская'}
+        )
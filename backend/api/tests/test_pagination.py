@@ -0,0 +1,55 @@
+from .base import APIBaseTestCase
+
+
+class CachedCountPaginationTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        cls.author = cls.create_user(1)
+        ingredients = cls.create_ingredients(2)
+        cls.recipes = [
+            cls.create_recipe(cls.author, ingredients, n) for n in range(3)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.api = self.client_for(self.user)
+
+    def test_new_subscription_is_listed_despite_cached_count(self):
+        url = '/api/users/subscriptions/'
+        self.assertEqual(self.api.get(url).json()['count'], 0)
+        response = self.api.post(f'/api/users/{self.author.pk}/subscribe/')
+        self.assertEqual(response.status_code, 201)
+
+        data = self.api.get(url).json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['id'], self.author.pk)
+
+    def test_new_favorite_is_listed_despite_cached_count(self):
+        url = '/api/recipes/?is_favorited=1&limit=2'
+        self.assertEqual(self.api.get(url).json()['count'], 0)
+        for recipe in self.recipes:
+            self.api.post(f'/api/recipes/{recipe.pk}/favorite/')
+
+        data = self.api.get(url).json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertGreaterEqual(data['count'], 3)
+        self.assertIsNotNone(data['next'])
+        self.assertEqual(len(self.api.get(data['next']).json()['results']), 1)
+
+    def test_out_of_range_page(self):
+        response = self.api.get('/api/recipes/?page=5')
+        self.assertEqual(response.status_code, 404)
+
+    def test_last_page(self):
+        for query in ('', '&count=0'):
+            with self.subTest(query=query):
+                data = self.api.get(
+                    f'/api/recipes/?limit=2&page=last{query}'
+                ).json()
+                self.assertEqual(
+                    [recipe['id'] for recipe in data['results']],
+                    [self.recipes[0].pk]
+                )
+                self.assertIsNone(data['next'])
+                self.assertIsNotNone(data['previous'])
@@ -0,0 +1,66 @@
+from recipes.models import Recipe
+from .base import APIBaseTestCase
+
+
+class RecipeFiltersTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = cls.create_user(0)
+        cls.ingredients = cls.create_ingredients(3)
+        a, b, c = cls.ingredients
+        cls.recipes = [
+            cls.create_recipe(author, ingredients, n)
+            for n, ingredients in enumerate(([a], [a, b], [b, c], [a, b, c]))
+        ]
+        for recipe, cooking_time, favorites in zip(
+            cls.recipes, (30, 10, 20, 10), (1, 5, 5, 0)
+        ):
+            Recipe.objects.filter(pk=recipe.pk).update(
+                cooking_time=cooking_time, favorites_count=favorites
+            )
+
+    def get_ids(self, query):
+        response = self.client.get('/api/recipes/', query)
+        self.assertEqual(response.status_code, 200)
+        return [recipe['id'] for recipe in response.json()['results']]
+
+    def ids(self, *positions):
+        return [self.recipes[position].pk for position in positions]
+
+    def test_orderings(self):
+        self.assertEqual(
+            self.get_ids({'ordering': 'popular'}), self.ids(2, 1, 0, 3)
+        )
+        self.assertEqual(
+            self.get_ids({'ordering': 'cooking_time'}), self.ids(3, 1, 2, 0)
+        )
+        self.assertEqual(
+            self.get_ids({'ordering': '-cooking_time'}), self.ids(0, 2, 3, 1)
+        )
+        self.assertEqual(
+            self.get_ids({'ordering': 'newest'}), self.ids(3, 2, 1, 0)
+        )
+
+    def test_unknown_ordering_is_rejected(self):
+        response = self.client.get('/api/recipes/', {'ordering': 'name'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cooking_time_range_is_inclusive(self):
+        self.assertEqual(
+            self.get_ids({'cooking_time_min': 10, 'cooking_time_max': 20}),
+            self.ids(3, 2, 1)
+        )
+        self.assertEqual(
+            self.get_ids({'cooking_time_min': 25}), self.ids(0)
+        )
+
+    def test_ingredients_must_all_match(self):
+        a, b, c = (ingredient.pk for ingredient in self.ingredients)
+        self.assertEqual(self.get_ids({'ingredients': [a]}), self.ids(3, 1, 0))
+        self.assertEqual(
+            self.get_ids({'ingredients': [a, b]}), self.ids(3, 1)
+        )
+        self.assertEqual(
+            self.get_ids({'ingredients': [a, c], 'ordering': 'popular'}),
+            self.ids(3)
+        )
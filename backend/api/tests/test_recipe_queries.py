@@ -0,0 +1,45 @@
+from recipes.catalogue import get_version
+from recipes.models import Recipe
+from .base import APIBaseTestCase, clear_caches
+
+
+class RecipeQueryBudgetTest(APIBaseTestCase):
+    LIST_BUDGET = 3
+    RETRIEVE_BUDGET = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        authors = [cls.create_user(n) for n in range(1, 6)]
+        ingredients = cls.create_ingredients(15)
+        for n in range(25):
+            cls.create_recipe(authors[n % len(authors)], ingredients, n)
+
+    def get(self, url, user, budget):
+        clear_caches()
+        get_version()
+        with self.assertNumQueries(budget):
+            response = self.client_for(user).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_query_budget_does_not_depend_on_limit(self):
+        for user in (None, self.user):
+            for limit in (1, 5, 20):
+                with self.subTest(user=user, limit=limit):
+                    data = self.get(
+                        f'/api/recipes/?limit={limit}', user,
+                        self.LIST_BUDGET
+                    )
+                    self.assertEqual(len(data['results']), limit)
+                    for recipe in data['results']:
+                        self.assertEqual(len(recipe['ingredients']), 15)
+
+    def test_retrieve_query_budget(self):
+        recipe = Recipe.objects.first()
+        for user in (None, self.user):
+            with self.subTest(user=user):
+                data = self.get(
+                    f'/api/recipes/{recipe.pk}/', user, self.RETRIEVE_BUDGET
+                )
+                self.assertEqual(len(data['ingredients']), 15)
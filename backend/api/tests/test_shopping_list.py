@@ -0,0 +1,62 @@
+from unittest import mock
+
+from api import shopping_list
+from recipes import cart_items
+from recipes.models import ShoppingCart
+from .base import APIBaseTestCase, clear_caches
+
+
+class ShoppingListExportTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user(0)
+        ingredients = cls.create_ingredients(3)
+        recipe = cls.create_recipe(cls.user, ingredients, 1)
+        ShoppingCart.objects.create(user=cls.user, recipe=recipe)
+        cart_items.rebuild_cart_items([cls.user.pk])
+
+    def download(self, fmt):
+        response = self.client_for(self.user).get(
+            '/api/recipes/download_shopping_cart/', {'format': fmt}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_text_export(self):
+        content = b''.join(self.download('txt').streaming_content).decode()
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn('ingredient 0', lines[1])
+
+    def test_all_formats(self):
+        for fmt in ('pdf', 'txt', 'csv', 'json'):
+            with self.subTest(fmt=fmt):
+                response = self.download(fmt)
+                self.assertIn(
+                    f'shopping_list.{fmt}', response['Content-Disposition']
+                )
+
+    def render_twice(self):
+        with mock.patch.object(
+            shopping_list, 'render_pdf', wraps=shopping_list.render_pdf
+        ) as render_pdf:
+            for _ in range(2):
+                content = b''.join(self.download('pdf').streaming_content)
+                self.assertTrue(content.startswith(b'%PDF'))
+        return render_pdf.call_count
+
+    def test_pdf_cached_only_below_buffer_size(self):
+        self.assertEqual(self.render_twice(), 1)
+        clear_caches()
+        with mock.patch.object(shopping_list, 'BUFFER_MAX_SIZE', 100):
+            self.assertEqual(self.render_twice(), 2)
+
+    def test_errors_are_json(self):
+        for fmt in ('pdf', 'txt', 'csv', 'json'):
+            with self.subTest(fmt=fmt):
+                response = self.client.get(
+                    '/api/recipes/download_shopping_cart/', {'format': fmt}
+                )
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertIn('detail', response.json())
@@ -0,0 +1,117 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing, contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+
+from recipes.cart_items import rebuild_cart_items
+from recipes.counters import (RECIPE_COUNTERS, USER_COUNTERS,
+                              reconcile_counters)
+from recipes.models import Recipe, ShoppingCartItem
+from .base import FixturesMixin, MediaMixin
+
+
+User = get_user_model()
+
+
+@contextmanager
+def sqlite_file_database():
+    connection.ensure_connection()
+    memory = connection.connection
+    settings = connection.settings_dict
+    original = settings['NAME'], settings['OPTIONS']
+    with tempfile.TemporaryDirectory() as directory:
+        settings['NAME'] = os.path.join(directory, 'db.sqlite3')
+        settings['OPTIONS'] = {
+            **settings['OPTIONS'], 'transaction_mode': 'IMMEDIATE'
+        }
+        with closing(sqlite3.connect(settings['NAME'])) as target:
+            memory.backup(target)
+        connection.connection = None
+        try:
+            yield
+        finally:
+            connection.close()
+            settings['NAME'], settings['OPTIONS'] = original
+            connection.connection = memory
+
+
+class ConcurrentToggleTest(MediaMixin, FixturesMixin, TransactionTestCase):
+    THREADS = 8
+    ROUNDS = 25
+
+    @classmethod
+    def setUpClass(cls):
+        # Shared-cache in-memory SQLite fails concurrent writers with
+        # 'table is locked' instead of waiting, so run on a file copy.
+        if connection.vendor == 'sqlite':
+            cls.enterClassContext(sqlite_file_database())
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        self.users = [self.create_user(n) for n in range(4)]
+        ingredients = self.create_ingredients(6)
+        self.recipes = [
+            self.create_recipe(self.users[n % 4], ingredients[n:n + 3], n)
+            for n in range(4)
+        ]
+        reconcile_counters(User.objects.all(), USER_COUNTERS)
+
+    def get_urls(self, user):
+        return [
+            f'/api/recipes/{recipe.pk}/{action}/'
+            for recipe in self.recipes
+            for action in ('favorite', 'shopping_cart')
+        ] + [
+            f'/api/users/{author.pk}/subscribe/'
+            for author in self.users if author != user
+        ]
+
+    def toggle(self, seed, barrier, statuses):
+        rng = random.Random(seed)
+        user = self.users[seed % len(self.users)]
+        client = self.client_for(user)
+        client.raise_request_exception = False
+        urls = self.get_urls(user)
+        barrier.wait()
+        try:
+            for _ in range(self.ROUNDS):
+                method = rng.choice((client.post, client.delete))
+                statuses.append(method(rng.choice(urls)).status_code)
+        finally:
+            connection.close()
+
+    def test_parallel_toggles_keep_state_consistent(self):
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+        threads = [
+            threading.Thread(target=self.toggle, args=(n, barrier, statuses))
+            for n in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(statuses), self.THREADS * self.ROUNDS)
+        self.assertLessEqual(set(statuses), {201, 204, 400})
+
+        self.assertEqual(
+            reconcile_counters(Recipe.objects.all(), RECIPE_COUNTERS), 0
+        )
+        self.assertEqual(
+            reconcile_counters(User.objects.all(), USER_COUNTERS), 0
+        )
+        items = set(ShoppingCartItem.objects.values_list(
+            'user_id', 'ingredient_id', 'amount'
+        ))
+        rebuild_cart_items([user.pk for user in self.users])
+        self.assertEqual(items, set(ShoppingCartItem.objects.values_list(
+            'user_id', 'ingredient_id', 'amount'
+        )))
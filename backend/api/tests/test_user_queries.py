@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+
+from recipes.counters import USER_COUNTERS, reconcile_counters
+from users.models import Subscriptions
+from .base import APIBaseTestCase, clear_caches
+
+
+User = get_user_model()
+
+
+class SubscriptionsQueryBudgetTest(APIBaseTestCase):
+    BUDGET = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.readers = {}
+        authors = [cls.create_user(n) for n in range(1, 25)]
+        ingredients = cls.create_ingredients(3)
+        for n, author in enumerate(authors):
+            for m in range(3):
+                cls.create_recipe(author, ingredients, n * 3 + m)
+        for n, follows in enumerate((6, 12, 24)):
+            reader = cls.create_user(100 + n)
+            Subscriptions.objects.bulk_create([
+                Subscriptions(user=reader, subscribe=author)
+                for author in authors[:follows]
+            ])
+            cls.readers[follows] = reader
+        reconcile_counters(User.objects.all(), USER_COUNTERS)
+
+    def test_query_budget_does_not_depend_on_followed_authors(self):
+        for follows, reader in self.readers.items():
+            with self.subTest(follows=follows):
+                clear_caches()
+                with self.assertNumQueries(self.BUDGET):
+                    response = self.client_for(reader).get(
+                        '/api/users/subscriptions/?limit=5&recipes_limit=2'
+                    )
+                data = response.json()
+                self.assertEqual(data['count'], follows)
+                self.assertEqual(len(data['results']), 5)
+                for author in data['results']:
+                    self.assertTrue(author['is_subscribed'])
+                    self.assertEqual(author['recipes_count'], 3)
+                    self.assertEqual(len(author['recipes']), 2)
+
+
+class UserListQueryBudgetTest(APIBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([
+            User(
+                email=f'user{n}@example.com',
+                username=f'user{n}',
+                first_name='First',
+                last_name='Last'
+            )
+            for n in range(1100)
+        ])
+        cls.reader = User.objects.get(username='user0')
+        cls.followed = set(
+            User.objects.order_by('?').exclude(
+                pk=cls.reader.pk
+            ).values_list('pk', flat=True)[:300]
+        )
+        Subscriptions.objects.bulk_create([
+            Subscriptions(user=cls.reader, subscribe_id=pk)
+            for pk in cls.followed
+        ])
+
+    def test_query_budget_does_not_depend_on_page_size(self):
+        for user, budget in ((None, 2), (self.reader, 3)):
+            for limit in (10, 100, 1000):
+                with self.subTest(user=user, limit=limit):
+                    clear_caches()
+                    with self.assertNumQueries(budget):
+                        response = self.client_for(user).get(
+                            f'/api/users/?limit={limit}'
+                        )
+                    results = response.json()['results']
+                    self.assertEqual(len(results), limit)
+                    for item in results:
+                        self.assertEqual(
+                            item['is_subscribed'],
+                            user is not None and item['id'] in self.followed
+                        )
@@ -1,34 +1,86 @@
+from functools import partial
+
 from rest_framework import viewsets, status
 from djoser.views import UserViewSet
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import (IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.pagesizes import A4
-from io import BytesIO
-from django.db.models import Sum
-
+from django.db import connection, transaction
+from django.db.models import (
+    BooleanField, F, Prefetch, Value, Window, prefetch_related_objects
+)
+from django.db.models.functions import RowNumber
+
+from recipes.catalogue import get_catalogue
+from recipes import relations
+from recipes.counters import change_counters
+from recipes.feed import fan_out, get_feed_ids
 from recipes.models import (Ingredient, Recipe, RecipeIngredient,
-                            ShoppingCart, FavoriteRecipes)
-from users.models import Subscriptions
-from .serializers import (IngredientSerializer, RecipeWriteSerializer,
+                            ShoppingCartItem)
+from .serializers import (IdListSerializer, IngredientSerializer,
+                          RecipeWriteSerializer,
                           RecipeReadSerializer, ShortRecipesSerializer,
                           SubscriptionsUserSerializer)
+from .conditional import (make_etag, not_modified, recipe_validators,
+                          set_validators)
+from .fast_read import RECIPE_FIELDS, build_recipes
 from .filters import IngredientFilter, RecipeFilter
+from .fragments import render_recipes
+from .paginators import CachedCountPagination, KeysetPagination
+from .renderers import FastJSONRenderer
+from .response_cache import AnonymousResponseCacheMixin
 from .permissions import IsAuthor
+from .shopping_list import SHOPPING_LIST_RENDERERS
 
 
 User = get_user_model()
 
 
+def batch_response(request, queryset, add, remove):
+    serializer = IdListSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    ids = list(dict.fromkeys(serializer.validated_data['ids']))
+
+    found = set(queryset.filter(pk__in=ids).values_list('pk', flat=True))
+    if request.method == 'POST':
+        changed, done = add(request.user, found), status.HTTP_201_CREATED
+    else:
+        changed, done = remove(request.user, found), status.HTTP_204_NO_CONTENT
+
+    return Response({'results': [
+        {
+            'id': pk,
+            'status': (
+                done if pk in changed
+                else status.HTTP_400_BAD_REQUEST if pk in found
+                else status.HTTP_404_NOT_FOUND
+            )
+        }
+        for pk in ids
+    ]})
+
+
+def toggle_relation(request, target, add, remove, serializer_class):
+    if request.method == 'POST':
+        if not add(request.user, [target.pk]):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        serializer = serializer_class(target, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    if not remove(request.user, [target.pk]):
+        return Response(status=status.HTTP_400_BAD_REQUEST)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class CustomUserViewSet(UserViewSet):
+    pagination_class = CachedCountPagination
+
     @action(
         methods=['get', 'put', 'patch', 'delete'],
         detail=False,
@@ -64,9 +116,25 @@ class CustomUserViewSet(UserViewSet):
     )
     def subscriptions(self, request):
         user = request.user
-        queryset = User.objects.filter(
-            subscriptions__user=user
+        limit = request.query_params.get('recipes_limit')
+
+        recipes = Recipe.objects.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F('author'),
+                order_by=F('id').desc()
+            )
         )
+        if limit and limit.isdigit():
+            recipes = recipes.filter(row_number__lte=int(limit))
+
+        queryset = User.objects.filter(
+            subscribers__user=user
+        ).annotate(
+            is_subscribed=Value(True, output_field=BooleanField())
+        ).prefetch_related(
+            Prefetch('recipes', queryset=recipes)
+        ).order_by('-id')
 
         page = self.paginate_queryset(queryset)
         serializer = SubscriptionsUserSerializer(
@@ -74,44 +142,30 @@ class CustomUserViewSet(UserViewSet):
         )
         return self.get_paginated_response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='subscribe',
+        url_name='subscribe-batch',
+        permission_classes=(IsAuthenticated,)
+    )
+    def subscribe_batch(self, request):
+        return batch_response(
+            request, User.objects.all(),
+            relations.subscribe, relations.unsubscribe
+        )
+
     @action(
         detail=True,
         methods=['post', 'delete'],
         permission_classes=(IsAuthenticated,)
     )
     def subscribe(self, request, id=None):
-        user = request.user
-        sub_user = self.get_object()
-
-        if user == sub_user:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-
-        user_in_subscriptions = user.subscriptions.filter(
-            subscribe=sub_user
-        ).exists()
-
-        if request.method == 'POST':
-            if user_in_subscriptions:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-
-            Subscriptions.objects.create(
-                user=user,
-                subscribe=sub_user
-            )
-            serializer = SubscriptionsUserSerializer(
-                sub_user, context={'request': request}
-            )
-            return Response(
-                serializer.data,
-                status=status.HTTP_201_CREATED
-            )
-        else:
-            if not user_in_subscriptions:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            user.subscriptions.filter(
-                subscribe=sub_user
-            ).delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        return toggle_relation(
+            request, self.get_object(),
+            relations.subscribe, relations.unsubscribe,
+            SubscriptionsUserSerializer
+        )
 
 
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
@@ -121,12 +175,129 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = IngredientFilter
     pagination_class = None
 
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get('name')
+        if name and connection.vendor == 'postgresql':
+            return super().list(request, *args, **kwargs)
+        catalogue = get_catalogue()
+        if name:
+            return Response(catalogue.search(name))
+        if request.accepted_renderer.format != 'json':
+            return Response(catalogue.items)
+
+        return not_modified(
+            request, catalogue.etag, catalogue.last_modified
+        ) or set_validators(
+            HttpResponse(catalogue.content, content_type='application/json'),
+            catalogue.etag,
+            catalogue.last_modified
+        )
 
-class RecipeViewSet(viewsets.ModelViewSet):
+    def retrieve(self, request, *args, **kwargs):
+        catalogue = get_catalogue()
+        item = catalogue.get(kwargs[self.lookup_field])
+        if item is None:
+            raise Http404
+
+        updated_at = catalogue.get_updated_at(item['id'])
+        etag = make_etag(item['id'], updated_at.isoformat())
+        last_modified = int(updated_at.timestamp())
+        return not_modified(request, etag, last_modified) or set_validators(
+            Response(item), etag, last_modified
+        )
+
+
+class RecipeViewSet(AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     filter_backends = [DjangoFilterBackend]
     filterset_class = RecipeFilter
+    pagination_class = CachedCountPagination
     permission_classes = [IsAuthor, IsAuthenticatedOrReadOnly]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.select_related(
+                'author'
+            ).with_user_flags(self.request.user)
+        return queryset
+
+    def get_ingredients_prefetch(self):
+        return Prefetch(
+            'ingredients',
+            queryset=RecipeIngredient.objects.select_related(
+                'ingredient'
+            ).order_by('pk')
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, ['recipes', 'authors'], self.list_recipes,
+            *args, **kwargs
+        )
+
+    def list_recipes(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if settings.RECIPE_LIST_FAST_PATH:
+            queryset = queryset.values(*RECIPE_FIELDS)
+        page = self.paginate_queryset(queryset)
+        recipes = page if page is not None else list(queryset)
+
+        if settings.RECIPE_LIST_FAST_PATH:
+            data = build_recipes(recipes, request)
+        else:
+            data = render_recipes(
+                recipes,
+                self.get_serializer_context(),
+                self.get_ingredients_prefetch()
+            )
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            [f'recipe:{kwargs[self.lookup_field]}', 'authors'],
+            self.retrieve_recipe,
+            *args,
+            **kwargs
+        )
+
+    def retrieve_recipe(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = recipe_validators(instance, request.user)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        data = render_recipes(
+            [instance],
+            self.get_serializer_context(),
+            self.get_ingredients_prefetch()
+        )[0]
+        return set_validators(Response(data), etag, last_modified)
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=(IsAuthenticated,)
+    )
+    def feed(self, request):
+        paginator = KeysetPagination()
+        ids = paginator.paginate_keys(
+            partial(get_feed_ids, request.user), request
+        )
+        recipes = Recipe.objects.select_related('author').with_user_flags(
+            request.user
+        ).in_bulk(ids)
+        data = render_recipes(
+            [recipes[pk] for pk in ids if pk in recipes],
+            self.get_serializer_context(),
+            self.get_ingredients_prefetch()
+        )
+        return paginator.get_paginated_response(data)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
@@ -137,6 +308,9 @@ class RecipeViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
+        prefetch_related_objects(
+            [serializer.instance], self.get_ingredients_prefetch()
+        )
 
         read_serializer = RecipeReadSerializer(
             serializer.instance,
@@ -144,12 +318,26 @@ class RecipeViewSet(viewsets.ModelViewSet):
         )
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            recipe = serializer.save()
+            change_counters(recipe.author, recipes_count=1)
+            fan_out(recipe)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            change_counters(instance.author, recipes_count=-1)
+
     def partial_update(self, request, pk=None):
         instance = self.get_object()
 
         serializer = self.get_serializer(instance, data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
+        prefetch_related_objects(
+            [serializer.instance], self.get_ingredients_prefetch()
+        )
 
         read_serializer = RecipeReadSerializer(
             serializer.instance,
@@ -157,52 +345,61 @@ class RecipeViewSet(viewsets.ModelViewSet):
         )
         return Response(read_serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='shopping_cart',
+        url_name='shopping-cart-batch',
+        permission_classes=(IsAuthenticated,)
+    )
+    def shopping_cart_batch(self, request):
+        return batch_response(
+            request, Recipe.objects.all(),
+            relations.add_to_shopping_cart, relations.remove_from_shopping_cart
+        )
+
     @action(
         detail=True,
         methods=['post', 'delete'],
         permission_classes=(IsAuthenticated,)
     )
     def shopping_cart(self, request, pk=None):
-        user = request.user
-        recipe = self.get_object()
-
-        recipe_in_shopping_cart = user.shopping_cart.filter(
-            recipe=recipe
-        ).exists()
-
-        if request.method == 'POST':
-            if recipe_in_shopping_cart:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-
-            ShoppingCart.objects.create(
-                user=user,
-                recipe=recipe
-            )
-            serializer = ShortRecipesSerializer(recipe)
-            return Response(
-                serializer.data,
-                status=status.HTTP_201_CREATED
-            )
-        else:
-            if not recipe_in_shopping_cart:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            user.shopping_cart.filter(recipe=recipe).delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        return toggle_relation(
+            request, self.get_object(),
+            relations.add_to_shopping_cart,
+            relations.remove_from_shopping_cart,
+            ShortRecipesSerializer
+        )
 
     @action(
         detail=False,
         methods=['get'],
-        permission_classes=(IsAuthenticated,)
+        permission_classes=(IsAuthenticated,),
+        renderer_classes=SHOPPING_LIST_RENDERERS
     )
     def download_shopping_cart(self, request):
-        data = RecipeIngredient.objects.filter(
-            recipe__in=request.user.shopping_cart.values('recipe')
+        data = ShoppingCartItem.objects.filter(
+            user=request.user
         ).values(
             'ingredient__name',
-            'ingredient__measurement_unit'
-        ).annotate(total_amount=Sum('amount'))
+            'ingredient__measurement_unit',
+            total_amount=F('amount')
+        ).order_by('ingredient__name')
 
-        return self.create_pdf_file(data)
+        return request.accepted_renderer.export(data)
+
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='favorite',
+        url_name='favorite-batch',
+        permission_classes=(IsAuthenticated,)
+    )
+    def favorite_batch(self, request):
+        return batch_response(
+            request, Recipe.objects.all(),
+            relations.add_favorites, relations.remove_favorites
+        )
 
     @action(
         detail=True,
@@ -210,34 +407,11 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def favorite(self, request, pk=None):
-        user = request.user
-        recipe = self.get_object()
-
-        recipe_in_favorite = user.favorite_recipes.filter(
-            recipe=recipe
-        ).exists()
-
-        if request.method == 'POST':
-            if recipe_in_favorite:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-
-            FavoriteRecipes.objects.create(
-                user=user,
-                recipe=recipe
-            )
-            serializer = ShortRecipesSerializer(
-                recipe,
-                context={'request': request}
-            )
-            return Response(
-                serializer.data,
-                status=status.HTTP_201_CREATED
-            )
-        else:
-            if not recipe_in_favorite:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            user.favorite_recipes.filter(recipe=recipe).delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        return toggle_relation(
+            request, self.get_object(),
+            relations.add_favorites, relations.remove_favorites,
+            ShortRecipesSerializer
+        )
 
     @action(
         detail=True,
@@ -254,38 +428,5 @@ class RecipeViewSet(viewsets.ModelViewSet):
         }
         return Response(data)
 
-    def create_pdf_file(self, data):
-        pdfmetrics.registerFont(TTFont('DejaVu', 'DejaVuSans.ttf'))
-        buffer = BytesIO()
-
-        pdf = canvas.Canvas(buffer, pagesize=A4)
-        pdf.setFont('DejaVu', 14)
-
-        y = 800
-        pdf.drawString(100, y, 'Список покупок:')
-
-        for item in data:
-            y -= 15
-            line = (
-                f'- {item['ingredient__name']}: {item['total_amount']} '
-                f'{item['ingredient__measurement_unit']}'
-            )
-
-            pdf.drawString(110, y, line)
-
-        pdf.showPage()
-        pdf.save()
-
-        buffer.seek(0)
-        return HttpResponse(
-            buffer,
-            content_type='application/pdf',
-            headers={
-                'Content-Disposition': (
-                    'attachment; filename="shopping_list.pdf"'
-                )
-            }
-        )
-
     def redirect_to_recipe(self, s_id=None):
         return redirect(f'/recipes/{int(s_id, 16)}/')
@@ -101,6 +101,34 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    },
+    'responses': {
+        'BACKEND': os.getenv(
+            'RESPONSE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', 'responses'),
+    },
+}
+
+# Seconds a process trusts the ingredient catalogue version read from the DB
+INGREDIENT_CATALOGUE_CHECK_INTERVAL = int(
+    os.getenv('INGREDIENT_CATALOGUE_CHECK_INTERVAL', 5)
+)
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -170,6 +198,23 @@ REST_FRAMEWORK = {
     }
 }
 
+# Background image variant workers, 0 processes images synchronously
+IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', 2))
+
+# Serializer-free recipe list read path
+RECIPE_LIST_FAST_PATH = os.getenv('RECIPE_LIST_FAST_PATH', '') == 'True'
+
+# Pagination counts
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', 30)
+)
+APPROXIMATE_COUNT_THRESHOLD = int(
+    os.getenv('APPROXIMATE_COUNT_THRESHOLD', 100000)
+)
+
+# Authors with this many subscribers are merged into feeds on read
+FEED_FANOUT_THRESHOLD = int(os.getenv('FEED_FANOUT_THRESHOLD', 10000))
+
 # Djoser
 DJOSER = {
     'HIDE_USERS': False,
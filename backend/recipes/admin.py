@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db import transaction
 
+from . import cart_items
 from .models import (Recipe, RecipeIngredient, Ingredient,
                      FavoriteRecipes, ShoppingCart)
 
@@ -19,7 +21,8 @@ class RecipeIngredientAdminInline(admin.TabularInline):
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ('name', 'text', 'cooking_time',
-                    'image', 'author')
+                    'image', 'author', 'favorites_count',
+                    'shopping_cart_count')
     search_fields = ('name',)
 
     fieldsets = (
@@ -30,6 +33,15 @@ class RecipeAdmin(admin.ModelAdmin):
     )
     inlines = [RecipeIngredientAdminInline]
 
+    def save_related(self, request, form, formsets, change):
+        recipe = form.instance
+        with transaction.atomic():
+            old_amounts = cart_items.get_recipe_amounts(recipe)
+            super().save_related(request, form, formsets, change)
+            cart_items.change_recipe_amounts(
+                recipe, old_amounts, cart_items.get_recipe_amounts(recipe)
+            )
+
 
 @admin.register(FavoriteRecipes, ShoppingCart)
 class FavoriteAndShoppingCartAdmin(admin.ModelAdmin):
@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models import Case, F, Sum, Value, When
+
+from .models import RecipeIngredient, ShoppingCart, ShoppingCartItem
+
+
+def get_recipe_amounts(recipe):
+    return dict(recipe.ingredients.values_list('ingredient_id', 'amount'))
+
+
+def update_cart_items(user_ids, deltas):
+    user_ids = list(user_ids)
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not user_ids or not deltas:
+        return
+
+    items = ShoppingCartItem.objects.filter(
+        user_id__in=user_ids,
+        ingredient_id__in=deltas
+    )
+    with transaction.atomic():
+        ShoppingCartItem.objects.bulk_create(
+            [
+                ShoppingCartItem(user_id=user_id, ingredient_id=pk)
+                for user_id in user_ids
+                for pk in deltas
+            ],
+            ignore_conflicts=True
+        )
+        items.update(amount=F('amount') + Case(
+            *[When(ingredient_id=pk, then=Value(delta))
+              for pk, delta in deltas.items()],
+            default=Value(0)
+        ))
+        items.filter(amount__lte=0).delete()
+
+
+def add_recipe(user, recipe):
+    update_cart_items([user.id], get_recipe_amounts(recipe))
+
+
+def remove_recipe(user, recipe):
+    update_cart_items([user.id], {
+        pk: -amount for pk, amount in get_recipe_amounts(recipe).items()
+    })
+
+
+def get_recipes_amounts(recipe_ids):
+    return dict(
+        RecipeIngredient.objects.filter(
+            recipe_id__in=recipe_ids
+        ).values('ingredient_id').annotate(
+            total=Sum('amount')
+        ).values_list('ingredient_id', 'total')
+    )
+
+
+def add_recipes(user, recipe_ids):
+    if recipe_ids:
+        update_cart_items([user.id], get_recipes_amounts(recipe_ids))
+
+
+def remove_recipes(user, recipe_ids):
+    if recipe_ids:
+        update_cart_items([user.id], {
+            pk: -amount
+            for pk, amount in get_recipes_amounts(recipe_ids).items()
+        })
+
+
+def remove_recipe_for_all(recipe):
+    update_cart_items(
+        ShoppingCart.objects.filter(
+            recipe=recipe
+        ).values_list('user_id', flat=True),
+        {pk: -amount for pk, amount in get_recipe_amounts(recipe).items()}
+    )
+
+
+def change_recipe_amounts(recipe, old_amounts, new_amounts):
+    update_cart_items(
+        ShoppingCart.objects.filter(
+            recipe=recipe
+        ).values_list('user_id', flat=True),
+        {
+            pk: new_amounts.get(pk, 0) - old_amounts.get(pk, 0)
+            for pk in old_amounts.keys() | new_amounts.keys()
+        }
+    )
+
+
+def rebuild_cart_items(user_ids):
+    user_ids = list(user_ids)
+    rows = RecipeIngredient.objects.filter(
+        recipe__shopping_cart__user_id__in=user_ids
+    ).values(
+        'recipe__shopping_cart__user_id', 'ingredient_id'
+    ).annotate(total_amount=Sum('amount'))
+
+    with transaction.atomic():
+        ShoppingCartItem.objects.filter(user_id__in=user_ids).delete()
+        ShoppingCartItem.objects.bulk_create(
+            ShoppingCartItem(
+                user_id=row['recipe__shopping_cart__user_id'],
+                ingredient_id=row['ingredient_id'],
+                amount=row['total_amount']
+            ) for row in rows
+        )
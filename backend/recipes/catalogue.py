@@ -0,0 +1,146 @@
+import hashlib
+import json
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from . import constants
+from .models import Ingredient
+
+
+VERSION_KEY = 'ingredients:catalogue:version'
+ITEMS_KEY = 'ingredients:catalogue:{version}'
+
+
+class PrefixIndex:
+    SEPARATOR = '\n'
+
+    def __init__(self, rows):
+        self.entries = sorted((name.lower(), pk) for pk, name in rows)
+        self.keys = [key for key, _ in self.entries]
+        self.text = self.SEPARATOR.join(self.keys)
+        self.offsets = list(accumulate(
+            (len(key) + len(self.SEPARATOR) for key in self.keys), initial=0
+        ))
+
+    def find(self, value):
+        found = self.text.find(value)
+        while found != -1:
+            position = bisect_right(self.offsets, found) - 1
+            yield position
+            found = self.text.find(value, self.offsets[position + 1])
+
+    def search(self, value):
+        value = value.lower()
+        start = bisect_left(self.keys, value)
+        end = bisect_left(self.keys, value + chr(0x10FFFF), start)
+
+        prefix = [pk for _, pk in self.entries[start:end]]
+        if (len(value) < constants.INGREDIENT_CONTAINS_MIN_LENGTH
+                or self.SEPARATOR in value):
+            return prefix, []
+        contains = [
+            self.entries[position][1] for position in self.find(value)
+            if position < start or position >= end
+        ]
+        return prefix, contains
+
+
+class IngredientCatalogue:
+    def __init__(self, version, changed_at, rows):
+        self.version = version
+        self.items = [
+            {key: row[key] for key in ('id', 'name', 'measurement_unit')}
+            for row in rows
+        ]
+        self.updated_at = {row['id']: row['updated_at'] for row in rows}
+        self.last_modified = int(max(changed_at, *(
+            updated_at.timestamp() for updated_at in self.updated_at.values()
+        )))
+        self.by_id = {item['id']: item for item in self.items}
+        self.index = PrefixIndex(
+            (item['id'], item['name']) for item in self.items
+        )
+        self.content = json.dumps(
+            self.items, ensure_ascii=False, separators=(',', ':')
+        ).encode()
+        self.etag = '"%s"' % hashlib.md5(self.content).hexdigest()
+
+    def get(self, pk):
+        if not str(pk).isdigit():
+            return None
+        return self.by_id.get(int(pk))
+
+    def search(self, value):
+        return [
+            self.by_id[pk]
+            for pks in self.index.search(value)
+            for pk in sorted(pks, key=lambda pk: self.by_id[pk]['name'])
+        ]
+
+    def get_updated_at(self, pk):
+        return self.updated_at[int(pk)]
+
+
+_catalogue = None
+_version = None
+
+
+def read_version():
+    stamp = Ingredient.objects.aggregate(
+        count=Count('pk'), updated_at=Max('updated_at')
+    )
+    updated_at = stamp['updated_at']
+    return f"{stamp['count']}:{updated_at.isoformat() if updated_at else ''}"
+
+
+def expire_version():
+    cache.delete(VERSION_KEY)
+
+
+def invalidate_catalogue():
+    transaction.on_commit(expire_version)
+
+
+def get_version_info():
+    global _version
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = read_version()
+        cache.set(
+            VERSION_KEY, version, settings.INGREDIENT_CATALOGUE_CHECK_INTERVAL
+        )
+    if _version is None or _version[0] != version:
+        _version = (version, time.time())
+    return _version
+
+
+def get_version():
+    return get_version_info()[0]
+
+
+def get_changed_at():
+    return get_version_info()[1]
+
+
+def get_catalogue():
+    global _catalogue
+    version, changed_at = get_version_info()
+    if _catalogue is not None and _catalogue.version == version:
+        return _catalogue
+
+    key = ITEMS_KEY.format(version=version)
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(Ingredient.objects.order_by('id').values(
+            'id', 'name', 'measurement_unit', 'updated_at'
+        ))
+        cache.set(key, rows, constants.INGREDIENT_CATALOGUE_TIMEOUT)
+
+    _catalogue = IngredientCatalogue(version, changed_at, rows)
+    return _catalogue
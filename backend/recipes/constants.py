@@ -2,3 +2,24 @@ INGREDIENT_NAME_MAX_LENGTH = 128
 INGREDIENT_MEASUREMENT_MAX_LENGTH = 64
 RECIPE_NAME_MAX_LENGTH = 256
 MIN_INTEGER_VALUE = 1
+INGREDIENT_CATALOGUE_TIMEOUT = 60 * 60 * 24
+INGREDIENT_CONTAINS_MIN_LENGTH = 3
+INGREDIENT_LOAD_BATCH_SIZE = 1000
+SHOPPING_CART_REBUILD_BATCH_SIZE = 500
+COUNTERS_RECONCILE_BATCH_SIZE = 1000
+RECIPE_FRAGMENT_TIMEOUT = 60 * 60
+IMAGE_VARIANT_SIZES = {
+    'thumbnail': 160,
+    'card': 480,
+    'full': 1200,
+}
+IMAGE_VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', 80),
+    'jpeg': ('JPEG', 'jpg', 85),
+}
+IMAGE_UPLOAD_MAX_BYTES = 8 * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS = 40_000_000
+IMAGE_DECODE_CHUNK_SIZE = 64 * 1024
+RELATION_BATCH_MAX_SIZE = 500
+FEED_FANOUT_BATCH_SIZE = 1000
+FEED_BACKFILL_SIZE = 50
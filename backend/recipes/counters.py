@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from users.models import Subscriptions
+from .models import FavoriteRecipes, Recipe, ShoppingCart
+
+
+User = get_user_model()
+
+RECIPE_COUNTERS = {
+    'favorites_count': (FavoriteRecipes, 'recipe'),
+    'shopping_cart_count': (ShoppingCart, 'recipe'),
+}
+USER_COUNTERS = {
+    'recipes_count': (Recipe, 'author'),
+    'subscribers_count': (Subscriptions, 'subscribe'),
+    'subscriptions_count': (Subscriptions, 'user'),
+}
+
+
+def change_counters(instance, **deltas):
+    type(instance).objects.filter(pk=instance.pk).update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+
+
+def change_counters_for(model, pks, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if pks and deltas:
+        model.objects.filter(pk__in=pks).update(**{
+            field: F(field) + delta for field, delta in deltas.items()
+        })
+
+
+def count_related(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                **{field: OuterRef('pk')}
+            ).order_by().values(field).annotate(
+                total=Count('pk')
+            ).values('total')
+        ),
+        Value(0)
+    )
+
+
+def reconcile_counters(queryset, counters):
+    actual = {
+        f'actual_{field}': count_related(*source)
+        for field, source in counters.items()
+    }
+    drifted = Q()
+    for field in counters:
+        drifted |= ~Q(**{field: F(f'actual_{field}')})
+
+    pks = list(
+        queryset.annotate(**actual).filter(drifted).values_list(
+            'pk', flat=True
+        )
+    )
+    if pks:
+        queryset.model.objects.filter(pk__in=pks).update(**{
+            field: count_related(*source)
+            for field, source in counters.items()
+        })
+    return len(pks)
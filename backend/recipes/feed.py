@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from users.models import Subscriptions
+from . import constants
+from .models import FeedEntry, Recipe
+
+
+def add_entries(user_ids, recipe_ids):
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(user_id=user_id, recipe_id=recipe_id)
+            for user_id in user_ids for recipe_id in recipe_ids
+        ],
+        batch_size=constants.FEED_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def fan_out(recipe):
+    if recipe.author.subscribers_count >= settings.FEED_FANOUT_THRESHOLD:
+        return
+    add_entries(
+        Subscriptions.objects.filter(
+            subscribe_id=recipe.author_id
+        ).values_list('user_id', flat=True),
+        [recipe.pk]
+    )
+
+
+def backfill(user, author_ids):
+    if not author_ids:
+        return
+    add_entries([user.pk], Recipe.objects.filter(
+        author_id__in=author_ids,
+        author__subscribers_count__lt=settings.FEED_FANOUT_THRESHOLD
+    ).annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=F('author_id'),
+            order_by=F('id').desc()
+        )
+    ).filter(
+        row_number__lte=constants.FEED_BACKFILL_SIZE
+    ).values_list('pk', flat=True))
+
+
+def remove_authors(user, author_ids):
+    if author_ids:
+        FeedEntry.objects.filter(
+            user=user, recipe__author_id__in=author_ids
+        ).delete()
+
+
+def get_feed_ids(user, before, limit):
+    entries = FeedEntry.objects.filter(user=user)
+    recipes = Recipe.objects.filter(author__in=Subscriptions.objects.filter(
+        user=user,
+        subscribe__subscribers_count__gte=settings.FEED_FANOUT_THRESHOLD
+    ).values('subscribe'))
+    if before is not None:
+        entries = entries.filter(recipe_id__lt=before)
+        recipes = recipes.filter(pk__lt=before)
+
+    ids = set(entries.order_by('-recipe_id').values_list(
+        'recipe_id', flat=True
+    )[:limit])
+    ids.update(recipes.order_by('-id').values_list('pk', flat=True)[:limit])
+    return sorted(ids, reverse=True)[:limit]
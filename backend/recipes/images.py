@@ -0,0 +1,110 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import constants
+
+
+variants_ready = Signal()
+
+_executor = None
+
+
+def variant_name(source, variant, extension):
+    directory, filename = posixpath.split(source)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'variants', f'{stem}_{variant}.{extension}'
+    )
+
+
+def generate_variants(field_file):
+    with field_file.open('rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            background = Image.new('RGB', image.size, 'white')
+            rgba = image.convert('RGBA')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            image = background
+
+    variants = {}
+    for variant, size in constants.IMAGE_VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        variants[variant] = {}
+        for image_format, (pil_format, extension, quality) in (
+            constants.IMAGE_VARIANT_FORMATS.items()
+        ):
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, quality=quality)
+            variants[variant][image_format] = field_file.storage.save(
+                variant_name(field_file.name, variant, extension),
+                ContentFile(buffer.getvalue())
+            )
+    return variants
+
+
+def delete_variants(value):
+    for formats in value.get('variants', {}).values():
+        for name in formats.values():
+            default_storage.delete(name)
+
+
+def process_image(model, pk, field_name, variants_field, source):
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or getattr(instance, field_name).name != source:
+        return
+    value = {'source': source, 'variants': {}}
+    if source:
+        value['variants'] = generate_variants(
+            getattr(instance, field_name)
+        )
+    updated = model.objects.filter(
+        pk=pk, **{field_name: source}
+    ).update(**{variants_field: value, 'updated_at': timezone.now()})
+    if updated:
+        delete_variants(getattr(instance, variants_field))
+        variants_ready.send(sender=model, instance=instance)
+    else:
+        delete_variants(value)
+
+
+def process_image_in_worker(*args):
+    try:
+        process_image(*args)
+    finally:
+        close_old_connections()
+
+
+def submit(*args):
+    global _executor
+    if not settings.IMAGE_PROCESSING_WORKERS:
+        process_image(*args)
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix='images'
+        )
+    _executor.submit(process_image_in_worker, *args)
+
+
+def schedule_variants(instance, field_name, variants_field):
+    source = getattr(instance, field_name).name or ''
+    current = getattr(instance, variants_field)
+    if current.get('source', '') == source:
+        return
+    transaction.on_commit(partial(
+        submit, type(instance), instance.pk, field_name, variants_field,
+        source
+    ))
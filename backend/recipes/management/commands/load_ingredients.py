@@ -1,21 +1,140 @@
+import csv
 import json
+import time
+from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
 
+from recipes import constants
+from recipes.catalogue import expire_version
 from recipes.models import Ingredient
 
 
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def read_csv(file):
+    for row in csv.reader(file):
+        if row:
+            yield {'name': row[0], 'measurement_unit': row[1]}
+
+
+def read_json_lines(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_json(file):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if not started and buffer:
+            if buffer[0] != '[':
+                raise CommandError('JSON file must contain a list.')
+            buffer = buffer[1:]
+            started = True
+            continue
+        if started:
+            buffer = buffer.lstrip(', \n\r\t')
+            if buffer.startswith(']'):
+                return
+            if buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise CommandError('JSON file is truncated.')
+                else:
+                    yield item
+                    buffer = buffer[end:]
+                    continue
+        if eof:
+            return
+        chunk = file.read(JSON_CHUNK_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+READERS = {
+    'csv': read_csv,
+    'json': read_json,
+    'jsonl': read_json_lines,
+}
+
+
 class Command(BaseCommand):
-    help = 'Загружает ингредиенты из JSON в базу данных'
+    help = 'Загружает ингредиенты из CSV, JSON или JSON Lines в базу данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=settings.BASE_DIR / 'data' / 'ingredients.csv'
+        )
+        parser.add_argument(
+            '--format',
+            choices=READERS,
+            help='Формат файла, по умолчанию определяется по расширению'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=constants.INGREDIENT_LOAD_BATCH_SIZE
+        )
 
     def handle(self, *args, **options):
-        with open('data/ingredients.json', 'r', encoding='utf-8') as ing_data:
-            ingredients = json.load(ing_data)
+        path = Path(options['path'])
+        file_format = options['format'] or path.suffix.lstrip('.')
+        if file_format not in READERS:
+            raise CommandError(f'Неизвестный формат файла: {path}')
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
 
-            for item in ingredients:
-                Ingredient.objects.get_or_create(
-                    name=item['name'],
-                    measurement_unit=item['measurement_unit']
-                )
+        started = time.monotonic()
+        total = 0
+        batch = {}
 
+        with open(path, 'r', encoding='utf-8') as ing_data:
+            for item in READERS[file_format](ing_data):
+                batch[item['name']] = item['measurement_unit']
+                if len(batch) >= batch_size:
+                    total += self.save_batch(batch)
+                    self.report(total, started)
+                    batch = {}
+
+        if batch:
+            total += self.save_batch(batch)
+            self.report(total, started)
+
+        expire_version()
         self.stdout.write(self.style.SUCCESS('Ингредиенты успешно загружены!'))
+
+    def save_batch(self, batch):
+        now = timezone.now()
+        with transaction.atomic():
+            Ingredient.objects.bulk_create(
+                [
+                    Ingredient(
+                        name=name, measurement_unit=unit, updated_at=now
+                    )
+                    for name, unit in batch.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['measurement_unit', 'updated_at']
+            )
+        return len(batch)
+
+    def report(self, total, started):
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else total
+        self.stdout.write(f'Загружено {total} строк ({rate:.0f} строк/с)')
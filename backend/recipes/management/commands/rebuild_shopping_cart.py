@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes import constants
+from recipes.models import ShoppingCart, ShoppingCartItem
+from recipes.cart_items import rebuild_cart_items
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает агрегированные списки покупок пользователей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=constants.SHOPPING_CART_REBUILD_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        user_ids = sorted(
+            set(ShoppingCart.objects.values_list('user_id', flat=True))
+            | set(ShoppingCartItem.objects.values_list('user_id', flat=True))
+        )
+        for start in range(0, len(user_ids), batch_size):
+            rebuild_cart_items(user_ids[start:start + batch_size])
+            self.stdout.write(
+                f'Пересчитано {min(start + batch_size, len(user_ids))} '
+                f'из {len(user_ids)} пользователей'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Списки покупок пересчитаны!'))
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes import constants
+from recipes.counters import (RECIPE_COUNTERS, USER_COUNTERS,
+                              reconcile_counters)
+from recipes.models import Recipe
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Исправляет расхождения в счётчиках рецептов и пользователей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=constants.COUNTERS_RECONCILE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        for model, counters in ((Recipe, RECIPE_COUNTERS),
+                                (User, USER_COUNTERS)):
+            fixed = 0
+            last_pk = 0
+            while True:
+                pks = list(
+                    model.objects.filter(pk__gt=last_pk).order_by(
+                        'pk'
+                    ).values_list('pk', flat=True)[:batch_size]
+                )
+                if not pks:
+                    break
+                fixed += reconcile_counters(
+                    model.objects.filter(pk__in=pks), counters
+                )
+                last_pk = pks[-1]
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: исправлено {fixed}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны!'))
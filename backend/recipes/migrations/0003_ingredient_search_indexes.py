@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+INDEXES = (
+    ('recipes_ingredient_name_lower_prefix',
+     'CREATE INDEX IF NOT EXISTS recipes_ingredient_name_lower_prefix '
+     'ON recipes_ingredient (lower(name) varchar_pattern_ops)'),
+    ('recipes_ingredient_name_lower_trgm',
+     'CREATE INDEX IF NOT EXISTS recipes_ingredient_name_lower_trgm '
+     'ON recipes_ingredient USING gin (lower(name) gin_trgm_ops)'),
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for _, sql in INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import BooleanField, Exists, OuterRef, Value
 from django.core.validators import MinValueValidator
 from django.contrib.auth import get_user_model
 
@@ -18,6 +19,10 @@ class Ingredient(models.Model):
         max_length=constants.INGREDIENT_MEASUREMENT_MAX_LENGTH,
         verbose_name='Measurement unit'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Updated at'
+    )
 
     class Meta:
         constraints = [
@@ -33,6 +38,31 @@ class Ingredient(models.Model):
         return self.name
 
 
+class RecipeQuerySet(models.QuerySet):
+    def with_user_flags(self, user):
+        if not user.is_authenticated:
+            false = Value(False, output_field=BooleanField())
+            return self.annotate(
+                is_favorited=false,
+                is_in_shopping_cart=false,
+                author_is_subscribed=false
+            )
+
+        from users.models import Subscriptions
+
+        return self.annotate(
+            is_favorited=Exists(FavoriteRecipes.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            )),
+            is_in_shopping_cart=Exists(ShoppingCart.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            )),
+            author_is_subscribed=Exists(Subscriptions.objects.filter(
+                user=user, subscribe=OuterRef('author')
+            ))
+        )
+
+
 class Recipe(models.Model):
     name = models.CharField(
         max_length=constants.RECIPE_NAME_MAX_LENGTH,
@@ -51,17 +81,51 @@ class Recipe(models.Model):
         verbose_name='Image',
         upload_to='recipes/'
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Image variants'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         verbose_name='Author',
         related_name='recipes'
     )
+    favorites_count = models.IntegerField(
+        default=0,
+        verbose_name='Favorites count'
+    )
+    shopping_cart_count = models.IntegerField(
+        default=0,
+        verbose_name='Shopping carts count'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Updated at'
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Recipe'
         verbose_name_plural = 'Recipes'
         ordering = ['-id']
+        indexes = [
+            models.Index(
+                fields=['author', '-id'],
+                name='recipe_author_newest_idx'
+            ),
+            models.Index(
+                fields=['-favorites_count', '-id'],
+                name='recipe_popular_idx'
+            ),
+            models.Index(
+                fields=['cooking_time', '-id'],
+                name='recipe_cooking_time_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -92,6 +156,12 @@ class RecipeIngredient(models.Model):
                 name="unique_recipe_ingredient"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['ingredient', 'recipe'],
+                name='recipeingredient_reverse_idx'
+            ),
+        ]
 
 
 class FavoriteRecipes(models.Model):
@@ -144,3 +214,59 @@ class ShoppingCart(models.Model):
 
     def __str__(self):
         return self.user.name
+
+
+class ShoppingCartItem(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='shopping_cart_items'
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='shopping_cart_items'
+    )
+    amount = models.IntegerField(
+        default=0,
+        verbose_name='Amount'
+    )
+
+    class Meta:
+        verbose_name = 'Shopping Cart Item'
+        verbose_name_plural = 'Shopping Cart Items'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name="unique_user_ingredient_shopping_cart_item"
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.ingredient}: {self.amount}'
+
+
+class FeedEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+
+    class Meta:
+        verbose_name = 'Feed Entry'
+        verbose_name_plural = 'Feed Entries'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recipe'],
+                name="unique_user_recipe_feed_entry"
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.recipe}'
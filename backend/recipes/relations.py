@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from users.models import Subscriptions
+from . import cart_items, feed
+from .counters import change_counters_for
+from .models import FavoriteRecipes, Recipe, ShoppingCart
+
+
+User = get_user_model()
+
+
+def get_columns(model, field):
+    quote = connection.ops.quote_name
+    return (
+        quote(model._meta.db_table),
+        quote(model._meta.get_field('user').column),
+        quote(model._meta.get_field(field).column),
+    )
+
+
+def insert_relations(model, user, field, target_ids):
+    target_ids = list(target_ids)
+    if not target_ids:
+        return set()
+    table, user_column, target_column = get_columns(model, field)
+    values = ', '.join(['(%s, %s)'] * len(target_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({user_column}, {target_column}) '
+            f'VALUES {values} ON CONFLICT DO NOTHING '
+            f'RETURNING {target_column}',
+            [value for pk in target_ids for value in (user.pk, pk)]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def delete_relations(model, user, field, target_ids):
+    target_ids = list(target_ids)
+    if not target_ids:
+        return set()
+    table, user_column, target_column = get_columns(model, field)
+    placeholders = ', '.join(['%s'] * len(target_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {user_column} = %s '
+            f'AND {target_column} IN ({placeholders}) '
+            f'RETURNING {target_column}',
+            [user.pk, *target_ids]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def add_favorites(user, recipe_ids):
+    with transaction.atomic():
+        created = insert_relations(FavoriteRecipes, user, 'recipe', recipe_ids)
+        change_counters_for(Recipe, created, favorites_count=1)
+    return created
+
+
+def remove_favorites(user, recipe_ids):
+    with transaction.atomic():
+        deleted = delete_relations(FavoriteRecipes, user, 'recipe', recipe_ids)
+        change_counters_for(Recipe, deleted, favorites_count=-1)
+    return deleted
+
+
+def add_to_shopping_cart(user, recipe_ids):
+    with transaction.atomic():
+        created = insert_relations(ShoppingCart, user, 'recipe', recipe_ids)
+        cart_items.add_recipes(user, created)
+        change_counters_for(Recipe, created, shopping_cart_count=1)
+    return created
+
+
+def remove_from_shopping_cart(user, recipe_ids):
+    with transaction.atomic():
+        deleted = delete_relations(ShoppingCart, user, 'recipe', recipe_ids)
+        cart_items.remove_recipes(user, deleted)
+        change_counters_for(Recipe, deleted, shopping_cart_count=-1)
+    return deleted
+
+
+def subscribe(user, author_ids):
+    with transaction.atomic():
+        created = insert_relations(
+            Subscriptions, user, 'subscribe', set(author_ids) - {user.pk}
+        )
+        change_counters_for(User, created, subscribers_count=1)
+        change_counters_for(User, [user.pk], subscriptions_count=len(created))
+        feed.backfill(user, created)
+    return created
+
+
+def unsubscribe(user, author_ids):
+    with transaction.atomic():
+        deleted = delete_relations(
+            Subscriptions, user, 'subscribe', author_ids
+        )
+        change_counters_for(User, deleted, subscribers_count=-1)
+        change_counters_for(
+            User, [user.pk], subscriptions_count=-len(deleted)
+        )
+        feed.remove_authors(user, deleted)
+    return deleted
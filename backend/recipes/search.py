@@ -0,0 +1,49 @@
+import json
+
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+from . import constants
+from .catalogue import get_catalogue
+
+
+PREFIX_RANK = 0
+CONTAINS_RANK = 1
+
+
+def rank(condition):
+    return Case(
+        When(condition, then=Value(PREFIX_RANK)),
+        default=Value(CONTAINS_RANK),
+        output_field=IntegerField()
+    )
+
+
+def json_pks(pks):
+    return RawSQL('SELECT value FROM json_each(%s)', [json.dumps(pks)])
+
+
+def search_ingredients(queryset, value):
+    value = value.lower()
+
+    if connections[queryset.db].vendor == 'postgresql':
+        queryset = queryset.annotate(name_lower=Lower('name'))
+        matches = queryset.filter(
+            name_lower__startswith=value
+        ).annotate(rank=Value(PREFIX_RANK))
+        if len(value) >= constants.INGREDIENT_CONTAINS_MIN_LENGTH:
+            matches = matches.union(queryset.filter(
+                name_lower__contains=value
+            ).exclude(
+                name_lower__startswith=value
+            ).annotate(rank=Value(CONTAINS_RANK)))
+        return matches.order_by('rank', 'name')
+
+    prefix, contains = get_catalogue().index.search(value)
+    return queryset.filter(
+        pk__in=json_pks(prefix + contains)
+    ).annotate(
+        rank=rank(Q(pk__in=json_pks(prefix)))
+    ).order_by('rank', 'name')
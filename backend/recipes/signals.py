@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from . import cart_items
+from .catalogue import invalidate_catalogue
+from .images import delete_variants, schedule_variants
+from .models import Ingredient, Recipe, ShoppingCart
+
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Ingredient)
+def reset_ingredient_catalogue(**kwargs):
+    invalidate_catalogue()
+
+
+@receiver(post_save, sender=Recipe)
+def schedule_recipe_image_variants(instance, **kwargs):
+    schedule_variants(instance, 'image', 'image_variants')
+
+
+@receiver(post_save, sender=User)
+def schedule_avatar_variants(instance, **kwargs):
+    schedule_variants(instance, 'avatar', 'avatar_variants')
+
+
+@receiver(post_delete, sender=Recipe)
+def delete_recipe_image_variants(instance, **kwargs):
+    delete_variants(instance.image_variants)
+
+
+@receiver(post_delete, sender=User)
+def delete_avatar_variants(instance, **kwargs):
+    delete_variants(instance.avatar_variants)
+
+
+@receiver(pre_delete, sender=Recipe)
+def remove_recipe_from_cart_items(instance, **kwargs):
+    cart_items.remove_recipe_for_all(instance)
+
+
+@receiver(pre_save, sender=ShoppingCart)
+def remove_replaced_cart_items(instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = ShoppingCart.objects.filter(pk=instance.pk).first()
+    if previous is not None:
+        cart_items.remove_recipe(previous.user, previous.recipe)
+
+
+@receiver(post_save, sender=ShoppingCart)
+def add_cart_items(instance, raw, **kwargs):
+    if not raw:
+        cart_items.add_recipe(instance.user, instance.recipe)
+
+
+@receiver(pre_delete, sender=ShoppingCart)
+def remove_cart_items(instance, origin, **kwargs):
+    if isinstance(origin, ShoppingCart) or (
+        getattr(origin, 'model', None) is ShoppingCart
+    ):
+        cart_items.remove_recipe(instance.user, instance.recipe)
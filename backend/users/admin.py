@@ -29,7 +29,8 @@ class SubscriptionsAdminInline(admin.TabularInline):
 @admin.register(CustomUser)
 class CustomUserAdmin(admin.ModelAdmin):
     search_fields = ['username']
-    list_display = ['username', 'email']
+    list_display = ['username', 'email', 'recipes_count',
+                    'subscribers_count', 'subscriptions_count']
     filter_horizontal = ['groups']
 
     fieldsets = (
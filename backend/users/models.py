@@ -49,6 +49,28 @@ class CustomUser(AbstractUser):
         null=True,
         verbose_name='Avatar'
     )
+    avatar_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Avatar variants'
+    )
+    recipes_count = models.IntegerField(
+        default=0,
+        verbose_name='Recipes count'
+    )
+    subscribers_count = models.IntegerField(
+        default=0,
+        verbose_name='Subscribers count'
+    )
+    subscriptions_count = models.IntegerField(
+        default=0,
+        verbose_name='Subscriptions count'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Updated at'
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ('username', 'first_name', 'last_name')